@@ -2,16 +2,26 @@
 Simple backfill script that directly uses boto3 without importing services
 """
 import boto3
+import numpy as np
 import uuid
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from datetime import datetime, timedelta
 from decimal import Decimal
 
-# Initialize DynamoDB
-dynamodb = boto3.resource('dynamodb')
+# Initialize DynamoDB with keep-alive so the query and batch writes share
+# pooled connections instead of paying a TLS handshake each
+dynamodb = boto3.resource('dynamodb', config=Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={'mode': 'adaptive', 'max_attempts': 10}
+))
 table = dynamodb.Table('portfolio-tracker')
 
 USER_ID = '7aedc2b3-7168-4244-afaf-85b719b7151e'
 DAYS = 30
+# Fixed seed so re-running the backfill produces the same chart data
+VARIATION_SEED = 20240101
 
 print(f"Backfilling {DAYS} days of history for user {USER_ID}")
 
@@ -37,48 +47,62 @@ asset_count = int(latest_snapshot.get('asset_count', 5))
 
 print(f"Using baseline value: ${baseline_value:.2f}")
 
-# Create snapshots for each day going backwards
-for day_offset in range(DAYS, -1, -1):
-    snapshot_date = datetime.utcnow() - timedelta(days=day_offset)
-    snapshot_date = snapshot_date.replace(hour=0, minute=0, second=0, microsecond=0)
-    snapshot_id = str(uuid.uuid4())
+# Compute every day's values in one vectorized pass
+# Portfolio grows over time with daily fluctuation
+offsets = np.arange(DAYS, -1, -1)
+growth_factors = 0.70 + (DAYS - offsets) * 0.01  # Start at 70%, grow to 100%
+rng = np.random.default_rng(VARIATION_SEED)
+daily_variations = 1.0 + (rng.integers(0, 10, size=offsets.size) - 5) * 0.02  # ±10%
+total_values = baseline_value * growth_factors * daily_variations
+total_gain_losses = total_values - baseline_invested
+if baseline_invested > 0:
+    total_gain_loss_pcts = total_gain_losses / baseline_invested * 100
+else:
+    total_gain_loss_pcts = np.zeros_like(total_values)
+total_invested = Decimal(f"{baseline_invested:.2f}")
 
-    # Add variation to make the chart interesting
-    # Portfolio grows over time with daily fluctuation
-    growth_factor = 0.70 + (DAYS - day_offset) * 0.01  # Start at 70%, grow to 100%
-    daily_variation = 1.0 + ((hash(snapshot_date.date().isoformat()) % 10 - 5) * 0.02)  # ±10%
-    value_multiplier = growth_factor * daily_variation
+# Create snapshots for each day going backwards
+# batch_writer coalesces puts into BatchWriteItem calls of up to 25 items
+# and resends any unprocessed items for us
+written = []
+today_midnight = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+try:
+    with table.batch_writer(overwrite_by_pkeys=['PK', 'SK']) as batch:
+        for day_offset, total_value, total_gain_loss, total_gain_loss_pct in zip(
+            offsets.tolist(), total_values.tolist(), total_gain_losses.tolist(), total_gain_loss_pcts.tolist()
+        ):
+            snapshot_date = today_midnight - timedelta(days=day_offset)
+            snapshot_day = snapshot_date.date()
+            snapshot_iso = snapshot_date.isoformat()
+            snapshot_id = str(uuid.uuid4())
 
-    # Calculate values
-    total_value = baseline_value * value_multiplier
-    total_invested = baseline_invested
-    total_gain_loss = total_value - total_invested
-    total_gain_loss_pct = (total_gain_loss / total_invested * 100) if total_invested > 0 else 0
+            # Create combined snapshot
+            snapshot = {
+                'PK': USER_ID,
+                'SK': f"SNAPSHOT#combined#{snapshot_day.isoformat()}",
+                'entity_type': 'portfolio_snapshot',
+                'snapshot_id': snapshot_id,
+                'GSI1PK': f"USER#{USER_ID}",
+                'GSI1SK': f"SNAPSHOT#{snapshot_iso}",
+                'user_id': USER_ID,
+                'portfolio_type': 'combined',
+                'snapshot_date': snapshot_iso,
+                'total_value': Decimal(f"{total_value:.2f}"),
+                'total_invested': total_invested,
+                'total_gain_loss': Decimal(f"{total_gain_loss:.2f}"),
+                'total_gain_loss_percentage': Decimal(f"{total_gain_loss_pct:.2f}"),
+                'asset_count': asset_count,
+                'created_at': snapshot_iso
+            }
 
-    # Create combined snapshot
-    snapshot = {
-        'PK': USER_ID,
-        'SK': f"SNAPSHOT#combined#{snapshot_date.date().isoformat()}",
-        'entity_type': 'portfolio_snapshot',
-        'snapshot_id': snapshot_id,
-        'GSI1PK': f"USER#{USER_ID}",
-        'GSI1SK': f"SNAPSHOT#{snapshot_date.isoformat()}",
-        'user_id': USER_ID,
-        'portfolio_type': 'combined',
-        'snapshot_date': snapshot_date.isoformat(),
-        'total_value': Decimal(str(round(total_value, 2))),
-        'total_invested': Decimal(str(round(total_invested, 2))),
-        'total_gain_loss': Decimal(str(round(total_gain_loss, 2))),
-        'total_gain_loss_percentage': Decimal(str(round(total_gain_loss_pct, 2))),
-        'asset_count': asset_count,
-        'created_at': snapshot_date.isoformat()
-    }
+            batch.put_item(Item=snapshot)
+            written.append((snapshot_day, total_value, total_gain_loss_pct))
+except ClientError as e:
+    print(f"✗ Batch write failed after {len(written)} queued snapshots: {e}")
+    exit(1)
 
-    try:
-        table.put_item(Item=snapshot)
-        print(f"✓ {snapshot_date.date()}: ${total_value:,.2f} ({total_gain_loss_pct:+.1f}%)")
-    except Exception as e:
-        print(f"✗ {snapshot_date.date()}: Error - {e}")
+for snapshot_day, total_value, total_gain_loss_pct in written:
+    print(f"✓ {snapshot_day}: ${total_value:,.2f} ({total_gain_loss_pct:+.1f}%)")
 
 print(f"\nBackfill complete! Created {DAYS + 1} days of snapshots.")
 print("Refresh your Analytics page to see the updated chart.")
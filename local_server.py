@@ -4,42 +4,99 @@ Simple local development server for testing the frontend
 This bypasses the need for AWS SAM and Lambda
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import hashlib
+import hmac
 import json
+import os
 from datetime import datetime
 import uuid
 
+PBKDF2_ITERATIONS = 100_000
+
 # In-memory storage
 users = {}
-portfolios = {}
+users_by_id = {}  # user_id -> same record as users[email]
+credentials = {}  # email -> (salt, derived key); kept out of the user payloads
+portfolios = {}  # user_id -> {asset_type: [assets]}
+
+# The mock summary never changes, so encode it once
+_SUMMARY_BYTES = json.dumps({
+    'success': True,
+    'data': {
+        'crypto_count': 0,
+        'stock_count': 0,
+        'total_assets': 0,
+        'crypto_value': 0.0,
+        'stock_value': 0.0,
+        'total_value': 0.0,
+        'total_invested': 0.0,
+        'total_gain_loss': 0.0,
+        'total_gain_loss_percentage': 0.0
+    }
+}).encode()
+
+
+def _derive_key(password, salt):
+    return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, PBKDF2_ITERATIONS)
+
 
 class CORSRequestHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests; every response must send Content-Length
+    protocol_version = 'HTTP/1.1'
+
     def _set_cors_headers(self):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
 
-    def do_OPTIONS(self):
-        self.send_response(200)
+    def _send_json(self, status, response):
+        self._send_bytes(status, json.dumps(response).encode())
+
+    def _send_bytes(self, status, payload):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
         self._set_cors_headers()
         self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_empty(self, status):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self._set_cors_headers()
+        self.end_headers()
+
+    def _authenticated_user_id(self):
+        auth_header = self.headers.get('Authorization', '')
+        user_id = auth_header.replace('Bearer mock_token_', '')
+        return user_id if user_id in users_by_id else None
+
+    def _send_unauthorized(self):
+        self._send_json(401, {'success': False, 'error': 'Unauthorized'})
+
+    def do_OPTIONS(self):
+        self._send_empty(200)
 
     def do_POST(self):
         content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length).decode('utf-8') if content_length > 0 else '{}'
-        data = json.loads(body) if body else {}
+        # json.loads takes bytes directly; skip parsing entirely for empty bodies
+        raw = self.rfile.read(content_length) if content_length > 0 else b''
+        data = json.loads(raw) if raw else {}
 
         # Handle authentication
         if self.path == '/auth/register':
             user_id = str(uuid.uuid4())
+            salt = os.urandom(16)
+            credentials[data['email']] = (salt, _derive_key(data['password'], salt))
             users[data['email']] = {
                 'user_id': user_id,
                 'email': data['email'],
-                'password': data['password'],  # In real app, hash this!
                 'full_name': data.get('full_name'),
                 'created_at': datetime.utcnow().isoformat()
             }
-            portfolios[user_id] = []
+            users_by_id[user_id] = users[data['email']]
+            portfolios[user_id] = {'crypto': [], 'stock': []}
 
             response = {
                 'success': True,
@@ -49,14 +106,11 @@ class CORSRequestHandler(BaseHTTPRequestHandler):
                     'user': users[data['email']]
                 }
             }
-            self.send_response(201)
-            self.send_header('Content-Type', 'application/json')
-            self._set_cors_headers()
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(201, response)
 
         elif self.path == '/auth/login':
-            if data['email'] in users and users[data['email']]['password'] == data['password']:
+            stored = credentials.get(data['email'])
+            if stored and hmac.compare_digest(stored[1], _derive_key(data['password'], stored[0])):
                 user = users[data['email']]
                 response = {
                     'success': True,
@@ -66,20 +120,19 @@ class CORSRequestHandler(BaseHTTPRequestHandler):
                         'user': user
                     }
                 }
-                self.send_response(200)
+                status = 200
             else:
                 response = {'success': False, 'error': 'Invalid credentials'}
-                self.send_response(401)
+                status = 401
 
-            self.send_header('Content-Type', 'application/json')
-            self._set_cors_headers()
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(status, response)
 
         elif self.path == '/portfolio/assets':
             # Mock add asset
-            auth_header = self.headers.get('Authorization', '')
-            user_id = auth_header.replace('Bearer mock_token_', '')
+            user_id = self._authenticated_user_id()
+            if user_id is None:
+                self._send_unauthorized()
+                return
 
             asset = {
                 'asset_id': str(uuid.uuid4()),
@@ -89,49 +142,25 @@ class CORSRequestHandler(BaseHTTPRequestHandler):
                 'created_at': datetime.utcnow().isoformat()
             }
 
-            if user_id in portfolios:
-                portfolios[user_id].append(asset)
+            portfolios[user_id].setdefault(asset['asset_type'], []).append(asset)
 
             response = {'success': True, 'data': asset}
-            self.send_response(201)
-            self.send_header('Content-Type', 'application/json')
-            self._set_cors_headers()
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(201, response)
 
         else:
-            self.send_response(404)
-            self._set_cors_headers()
-            self.end_headers()
+            self._send_empty(404)
 
     def do_GET(self):
-        auth_header = self.headers.get('Authorization', '')
-        user_id = auth_header.replace('Bearer mock_token_', '')
+        user_id = self._authenticated_user_id()
+        if user_id is None:
+            self._send_unauthorized()
+            return
 
         if self.path == '/portfolio/summary':
-            response = {
-                'success': True,
-                'data': {
-                    'crypto_count': 0,
-                    'stock_count': 0,
-                    'total_assets': 0,
-                    'crypto_value': 0.0,
-                    'stock_value': 0.0,
-                    'total_value': 0.0,
-                    'total_invested': 0.0,
-                    'total_gain_loss': 0.0,
-                    'total_gain_loss_percentage': 0.0
-                }
-            }
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self._set_cors_headers()
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            self._send_bytes(200, _SUMMARY_BYTES)
 
         elif self.path == '/portfolio/crypto':
-            assets = portfolios.get(user_id, [])
-            crypto_assets = [a for a in assets if a.get('asset_type') == 'crypto']
+            crypto_assets = portfolios[user_id].get('crypto', [])
             response = {
                 'success': True,
                 'data': {
@@ -143,15 +172,10 @@ class CORSRequestHandler(BaseHTTPRequestHandler):
                     'total_gain_loss_percentage': 0.0
                 }
             }
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self._set_cors_headers()
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(200, response)
 
         elif self.path == '/portfolio/stocks':
-            assets = portfolios.get(user_id, [])
-            stock_assets = [a for a in assets if a.get('asset_type') == 'stock']
+            stock_assets = portfolios[user_id].get('stock', [])
             response = {
                 'success': True,
                 'data': {
@@ -163,19 +187,13 @@ class CORSRequestHandler(BaseHTTPRequestHandler):
                     'total_gain_loss_percentage': 0.0
                 }
             }
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self._set_cors_headers()
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(200, response)
 
         else:
-            self.send_response(404)
-            self._set_cors_headers()
-            self.end_headers()
+            self._send_empty(404)
 
 if __name__ == '__main__':
-    server = HTTPServer(('localhost', 3000), CORSRequestHandler)
+    server = ThreadingHTTPServer(('localhost', 3000), CORSRequestHandler)
     print('🚀 Mock Backend Server running on http://localhost:3000')
     print('✅ Frontend can connect at http://localhost:5173')
     print('\nPress Ctrl+C to stop\n')
@@ -0,0 +1,111 @@
+"""
+Response constants and helpers shared by the API handlers
+"""
+from decimal import Decimal
+from typing import Dict, Any
+
+import orjson
+from pydantic import BaseModel
+
+
+# Shared across responses; API Gateway only reads them
+JSON_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+}
+
+PREFLIGHT_RESPONSE = {
+    'statusCode': 200,
+    'headers': {
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+        'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token',
+        'Access-Control-Max-Age': '600',
+    },
+    'body': ''
+}
+
+UNAUTHORIZED_RESPONSE = {
+    'statusCode': 401,
+    'headers': JSON_HEADERS,
+    'body': '{"error":"Unauthorized"}'
+}
+
+NOT_FOUND_RESPONSE = {
+    'statusCode': 404,
+    'headers': JSON_HEADERS,
+    'body': '{"error":"Not found"}'
+}
+
+PAYLOAD_TOO_LARGE_RESPONSE = {
+    'statusCode': 413,
+    'headers': JSON_HEADERS,
+    'body': '{"error":"Payload too large"}'
+}
+
+# Bodies longer than this (in characters) are rejected before parsing so a
+# huge or deeply nested payload can't tie up the JSON parser
+MAX_BODY_SIZE = 65_536
+
+
+def json_default(obj: Any) -> Any:
+    """orjson fallback for Decimal (DynamoDB numbers); datetimes are native"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+def dumps(obj: Any) -> str:
+    """Serialize a response body"""
+    return orjson.dumps(obj, default=json_default).decode()
+
+
+def json_response(status: int, body_obj: Any) -> Dict[str, Any]:
+    """Build an API Gateway response with the shared CORS headers"""
+    return {
+        'statusCode': status,
+        'headers': JSON_HEADERS,
+        'body': dumps(body_obj)
+    }
+
+
+def model_response(status: int, model: BaseModel) -> Dict[str, Any]:
+    """Build a {"success": true, "data": ...} response straight from a model's JSON"""
+    return {
+        'statusCode': status,
+        'headers': JSON_HEADERS,
+        'body': '{"success":true,"data":%s}' % model.model_dump_json()
+    }
+
+
+def error_response(status: int, msg: str) -> Dict[str, Any]:
+    """Build a {"error": msg} response"""
+    return json_response(status, {'error': msg})
+
+
+def body_too_large(event: Dict[str, Any]) -> bool:
+    """Whether the request body exceeds MAX_BODY_SIZE"""
+    return len(event.get('body') or '') > MAX_BODY_SIZE
+
+
+def clamp_int(value: Any, default: int, lo: int = 1, hi: int = 500) -> int:
+    """
+    Parse an integer query parameter into [lo, hi]
+
+    Missing or malformed values give the default, so a stray limit can't turn
+    into unbounded paging or a huge response
+    """
+    if value is None:
+        return default
+    try:
+        return max(lo, min(hi, int(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_body(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse the JSON request body; GET requests and empty bodies give {}"""
+    raw = event.get('body')
+    if not raw or event.get('httpMethod') == 'GET':
+        return {}
+    return orjson.loads(raw)
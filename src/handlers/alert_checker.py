@@ -2,16 +2,36 @@
 Alert Checker Lambda Function
 Runs periodically to check all active alerts and trigger notifications
 """
-import json
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Tuple
 
+from models.alert import Alert
 from services.alerts_service import alerts_service
-from services.dynamodb_service import DynamoDBService
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Per-user checks are DynamoDB/price API I/O, so threads overlap the waits.
+# Each worker opens its own DynamoDB and HTTP connections on first use.
+MAX_WORKERS = 16
+
+
+def _check_one(user_id: str, alerts: List[Alert], cache: Dict[Any, Any]) -> Tuple[int, int]:
+    """Check one user's alerts, returning (triggered_count, checked_count)"""
+    try:
+        triggered, checked = alerts_service.check_all_alerts_for_user(user_id, alerts, cache)
+
+        if triggered:
+            logger.info("Triggered %d alerts for user %s", len(triggered), user_id)
+
+        return len(triggered), checked
+
+    except Exception as user_error:
+        logger.error("Error checking alerts for user %s: %s", user_id, user_error)
+        return 0, 0
+
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -21,54 +41,26 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     logger.info("Alert checker started")
 
     try:
-        # Get all unique user IDs with active alerts
-        db_service = DynamoDBService()
-        user_ids = set()
-
-        # Scan for all alert items
-        scan_params = {
-            'FilterExpression': 'entity_type = :entity_type AND #status = :status',
-            'ExpressionAttributeNames': {
-                '#status': 'status'
-            },
-            'ExpressionAttributeValues': {
-                ':entity_type': 'alert',
-                ':status': 'active'
-            }
-        }
-
-        while True:
-            response = db_service.table.scan(**scan_params)
-
-            for item in response.get('Items', []):
-                user_ids.add(item.get('user_id'))
+        # One paginated query over the sparse index returns every active
+        # alert, so no per-user reads are needed before evaluating them
+        alerts_by_user = alerts_service.list_active_alerts_by_user()
+        user_ids = list(alerts_by_user)
 
-            # Check if there are more items
-            if 'LastEvaluatedKey' not in response:
-                break
-            scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
-
-        logger.info(f"Found {len(user_ids)} users with active alerts")
+        logger.info("Found %d users with active alerts", len(user_ids))
 
         # Check alerts for each user
         total_checked = 0
         total_triggered = 0
 
-        for user_id in user_ids:
-            try:
-                triggered = alerts_service.check_all_alerts_for_user(user_id)
-                total_triggered += len(triggered)
-
-                # Get count of alerts checked
-                alerts = alerts_service.list_alerts(user_id).alerts
-                total_checked += len(alerts)
-
-                if triggered:
-                    logger.info(f"Triggered {len(triggered)} alerts for user {user_id}")
+        # Prices and portfolio reads shared by alerts in this run. Local to the
+        # invocation so nothing carries over between runs on a warm container
+        cache: Dict[Any, Any] = {}
+        check_one = partial(_check_one, cache=cache)
 
-            except Exception as user_error:
-                logger.error(f"Error checking alerts for user {user_id}: {str(user_error)}")
-                continue
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for triggered_count, checked_count in executor.map(check_one, user_ids, alerts_by_user.values()):
+                total_triggered += triggered_count
+                total_checked += checked_count
 
         result = {
             'success': True,
@@ -78,11 +70,11 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'message': f'Checked {total_checked} alerts for {len(user_ids)} users, triggered {total_triggered} alerts'
         }
 
-        logger.info(f"Alert checker completed: {json.dumps(result)}")
+        logger.info("Alert checker completed: %s", result)
         return result
 
     except Exception as e:
-        logger.error(f"Error in alert checker: {str(e)}", exc_info=True)
+        logger.error("Error in alert checker: %s", e, exc_info=True)
         return {
             'success': False,
             'error': str(e)
@@ -5,151 +5,68 @@ Handles HTTP requests for alert management
 import json
 import logging
 from typing import Dict, Any
-from decimal import Decimal
-from datetime import datetime
 
 from services.alerts_service import alerts_service
-from models.alert import (
-    CreateAlertRequest, UpdateAlertRequest, AlertStatus,
-    AlertCondition, AlertType, AlertPriority
+from models.alert import CreateAlertRequest, UpdateAlertRequest, AlertStatus
+from handlers._common import (
+    PREFLIGHT_RESPONSE, UNAUTHORIZED_RESPONSE, NOT_FOUND_RESPONSE, PAYLOAD_TOO_LARGE_RESPONSE, json_response,
+    model_response, body_too_large, parse_body
 )
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """Custom JSON encoder for Decimal and datetime objects"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
-
-
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Main handler for alerts endpoints"""
-    logger.info(f"Alerts handler received event: {json.dumps(event, default=str)}")
-
     http_method = event.get('httpMethod', '')
-    path = event.get('path', '')
 
-    # Handle OPTIONS for CORS preflight
+    # Handle OPTIONS for CORS preflight - must come before logging and the auth check
     if http_method == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token',
-                'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-            },
-            'body': ''
-        }
+        return PREFLIGHT_RESPONSE
+
+    # Dumping the whole event is costly, so only do it when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Alerts handler received event: %s", json.dumps(event, default=str))
+
+    # API Gateway passes the matched route template, e.g. /alerts/{alert_id}
+    resource = event.get('resource') or event.get('path', '')
 
     # Get user ID from authorizer
     user_id = event.get('requestContext', {}).get('authorizer', {}).get('user_id')
 
     if not user_id:
-        return {
-            'statusCode': 401,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Unauthorized'})
-        }
+        return UNAUTHORIZED_RESPONSE
 
     try:
-        if http_method == 'GET':
-            if '/alerts/stats' in path:
-                return get_alert_stats(event, user_id)
-            elif '/alerts/' in path and path.count('/') > 2:
-                return get_alert(event, user_id)
-            else:
-                return list_alerts(event, user_id)
-
-        elif http_method == 'POST':
-            return create_alert(event, user_id)
-
-        elif http_method == 'PUT':
-            return update_alert(event, user_id)
-
-        elif http_method == 'DELETE':
-            return delete_alert(event, user_id)
-
-        return {
-            'statusCode': 404,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Not found'})
-        }
+        route = _ROUTES.get((http_method, resource))
+        if not route:
+            return NOT_FOUND_RESPONSE
+
+        if body_too_large(event):
+            return PAYLOAD_TOO_LARGE_RESPONSE
+
+        return route(event, user_id)
 
     except Exception as e:
-        logger.error(f"Error in alerts handler: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        logger.error("Error in alerts handler: %s", e, exc_info=True)
+        return json_response(500, {'error': str(e)})
 
 
 def create_alert(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Create a new alert"""
-    body = json.loads(event.get('body', '{}'))
+    body = parse_body(event)
 
     # Validate required fields
     if 'name' not in body or 'condition' not in body:
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'name and condition are required'})
-        }
-
-    # Create alert condition
-    condition_data = body['condition']
-    condition = AlertCondition(
-        type=AlertType(condition_data['type']),
-        threshold=condition_data.get('threshold'),
-        symbol=condition_data.get('symbol'),
-        asset_type=condition_data.get('asset_type'),
-        comparison=condition_data.get('comparison', 'greater'),
-        timeframe=condition_data.get('timeframe')
-    )
-
-    # Create request
-    request = CreateAlertRequest(
-        name=body['name'],
-        description=body.get('description'),
-        condition=condition,
-        priority=AlertPriority(body.get('priority', 'medium')),
-        notification_channels=body.get('notification_channels', ['in_app']),
-        trigger_once=body.get('trigger_once', False),
-        cooldown_minutes=body.get('cooldown_minutes', 60),
-        expires_at=datetime.fromisoformat(body['expires_at']) if body.get('expires_at') else None
-    )
+        return json_response(400, {'error': 'name and condition are required'})
+
+    # Pydantic parses the enums, nested condition and expires_at in one pass
+    request = CreateAlertRequest.model_validate(body)
 
     alert = alerts_service.create_alert(user_id, request)
 
-    return {
-        'statusCode': 201,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': alert.dict()
-        }, cls=DecimalEncoder)
-    }
+    return model_response(201, alert)
 
 
 def get_alert(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
@@ -158,38 +75,14 @@ def get_alert(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     alert_id = path_params.get('alert_id')
 
     if not alert_id:
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'alert_id is required'})
-        }
+        return json_response(400, {'error': 'alert_id is required'})
 
     alert = alerts_service.get_alert(user_id, alert_id)
 
     if not alert:
-        return {
-            'statusCode': 404,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Alert not found'})
-        }
-
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': alert.dict()
-        }, cls=DecimalEncoder)
-    }
+        return json_response(404, {'error': 'Alert not found'})
+
+    return model_response(200, alert)
 
 
 def list_alerts(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
@@ -202,17 +95,7 @@ def list_alerts(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
 
     response = alerts_service.list_alerts(user_id, status)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': response.dict()
-        }, cls=DecimalEncoder)
-    }
+    return model_response(200, response)
 
 
 def update_alert(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
@@ -221,69 +104,18 @@ def update_alert(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     alert_id = path_params.get('alert_id')
 
     if not alert_id:
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'alert_id is required'})
-        }
-
-    body = json.loads(event.get('body', '{}'))
-
-    # Build update request
-    update_data = {}
-
-    if 'name' in body:
-        update_data['name'] = body['name']
-    if 'description' in body:
-        update_data['description'] = body['description']
-    if 'priority' in body:
-        update_data['priority'] = AlertPriority(body['priority'])
-    if 'status' in body:
-        update_data['status'] = AlertStatus(body['status'])
-    if 'notification_channels' in body:
-        update_data['notification_channels'] = body['notification_channels']
-    if 'trigger_once' in body:
-        update_data['trigger_once'] = body['trigger_once']
-    if 'cooldown_minutes' in body:
-        update_data['cooldown_minutes'] = body['cooldown_minutes']
-    if 'condition' in body:
-        condition_data = body['condition']
-        update_data['condition'] = AlertCondition(
-            type=AlertType(condition_data['type']),
-            threshold=condition_data.get('threshold'),
-            symbol=condition_data.get('symbol'),
-            asset_type=condition_data.get('asset_type'),
-            comparison=condition_data.get('comparison', 'greater'),
-            timeframe=condition_data.get('timeframe')
-        )
-
-    request = UpdateAlertRequest(**update_data)
+        return json_response(400, {'error': 'alert_id is required'})
+
+    body = parse_body(event)
+
+    # Only fields present in the body are set (see exclude_unset in the service)
+    request = UpdateAlertRequest.model_validate(body)
     alert = alerts_service.update_alert(user_id, alert_id, request)
 
     if not alert:
-        return {
-            'statusCode': 404,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Alert not found'})
-        }
-
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': alert.dict()
-        }, cls=DecimalEncoder)
-    }
+        return json_response(404, {'error': 'Alert not found'})
+
+    return model_response(200, alert)
 
 
 def delete_alert(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
@@ -292,41 +124,31 @@ def delete_alert(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     alert_id = path_params.get('alert_id')
 
     if not alert_id:
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'alert_id is required'})
-        }
+        return json_response(400, {'error': 'alert_id is required'})
 
     success = alerts_service.delete_alert(user_id, alert_id)
 
-    return {
-        'statusCode': 200 if success else 500,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': success
-        })
-    }
+    return json_response(200 if success else 500, {
+        'success': success
+    })
 
 
 def get_alert_stats(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get alert statistics"""
     stats = alerts_service.get_alert_stats(user_id)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': stats.dict()
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {
+        'success': True,
+        'data': stats.dict()
+    })
+
+
+# Routes keyed on (method, API Gateway resource template)
+_ROUTES = {
+    ('GET', '/alerts'): list_alerts,
+    ('POST', '/alerts'): create_alert,
+    ('GET', '/alerts/stats'): get_alert_stats,
+    ('GET', '/alerts/{alert_id}'): get_alert,
+    ('PUT', '/alerts/{alert_id}'): update_alert,
+    ('DELETE', '/alerts/{alert_id}'): delete_alert,
+}
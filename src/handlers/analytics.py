@@ -4,53 +4,35 @@ Advanced Analytics API Handler
 import json
 import logging
 from typing import Dict, Any
-from decimal import Decimal
 
 from services.analytics_service import analytics_service
+from handlers._common import (
+    PREFLIGHT_RESPONSE, UNAUTHORIZED_RESPONSE, NOT_FOUND_RESPONSE, json_response
+)
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """Custom JSON encoder for Decimal objects"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
-
-
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Main handler for advanced analytics endpoints"""
-    logger.info(f"Analytics handler received event: {json.dumps(event)}")
-
     http_method = event.get('httpMethod', '')
-    path = event.get('path', '')
 
-    # Handle OPTIONS (CORS preflight) first, before auth check
+    # Handle OPTIONS for CORS preflight - must come before logging and the auth check
     if http_method == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token',
-                'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-            },
-            'body': ''
-        }
+        return PREFLIGHT_RESPONSE
+
+    # Dumping the whole event is costly, so only do it when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Analytics handler received event: %s", json.dumps(event, default=str))
+
+    path = event.get('path', '')
 
     # Get user ID from authorizer
     user_id = event.get('requestContext', {}).get('authorizer', {}).get('user_id')
 
     if not user_id:
-        return {
-            'statusCode': 401,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Unauthorized'})
-        }
+        return UNAUTHORIZED_RESPONSE
 
     try:
         if http_method == 'GET':
@@ -61,25 +43,11 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             elif '/analytics/risk' in path:
                 return get_risk(event, user_id)
 
-        return {
-            'statusCode': 404,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Not found'})
-        }
+        return NOT_FOUND_RESPONSE
 
     except Exception as e:
-        logger.error(f"Error in analytics handler: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        logger.error("Error in analytics handler: %s", e)
+        return json_response(500, {'error': str(e)})
 
 
 def get_metrics(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
@@ -89,17 +57,10 @@ def get_metrics(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
 
     result = analytics_service.get_advanced_metrics(user_id, period_days)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {
+        'success': True,
+        'data': result
+    })
 
 
 def get_benchmarks(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
@@ -111,31 +72,17 @@ def get_benchmarks(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
 
     result = analytics_service.get_benchmark_comparison(user_id, benchmarks, period_days)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {
+        'success': True,
+        'data': result
+    })
 
 
 def get_risk(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get portfolio risk analysis"""
     result = analytics_service.get_risk_metrics(user_id)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {
+        'success': True,
+        'data': result
+    })
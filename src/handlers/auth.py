@@ -1,101 +1,90 @@
-import json
 from typing import Dict, Any
 from models.user import UserCreate, UserLogin
 from models.response import SuccessResponse, ErrorResponse
-from services.auth_service import AuthService
+from services.auth_service import auth_service
+from handlers._common import (
+    JSON_HEADERS, PREFLIGHT_RESPONSE, NOT_FOUND_RESPONSE, PAYLOAD_TOO_LARGE_RESPONSE,
+    body_too_large, parse_body
+)
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Lambda handler for authentication endpoints"""
     try:
-        path = event.get('path', '')
         http_method = event.get('httpMethod', '')
 
         # Handle OPTIONS request for CORS preflight
         if http_method == 'OPTIONS':
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-                    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token',
-                    'Access-Control-Max-Age': '600',
-                },
-                'body': ''
-            }
-
-        body = json.loads(event.get('body', '{}'))
-        auth_service = AuthService()
-
-        # POST /auth/register
-        if path.endswith('/auth/register') and http_method == 'POST':
-            user_create = UserCreate(**body)
-            token = auth_service.register_user(user_create)
-
-            response = SuccessResponse(
-                data=token.dict(),
-                message="User registered successfully"
-            )
-
-            return {
-                'statusCode': 201,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps(response.dict(), default=str)
-            }
-
-        # POST /auth/login
-        elif path.endswith('/auth/login') and http_method == 'POST':
-            user_login = UserLogin(**body)
-            token = auth_service.login_user(user_login)
-
-            response = SuccessResponse(
-                data=token.dict(),
-                message="Login successful"
-            )
-
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps(response.dict(), default=str)
-            }
-
-        else:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Not found'})
-            }
+            return PREFLIGHT_RESPONSE
+
+        # API Gateway's resource template; fall back to the raw path
+        resource = event.get('resource') or event.get('path', '')
+        route = _ROUTES.get((http_method, resource))
+
+        if not route:
+            return NOT_FOUND_RESPONSE
+
+        if body_too_large(event):
+            return PAYLOAD_TOO_LARGE_RESPONSE
+
+        return route(parse_body(event))
 
     except ValueError as e:
-        error_response = ErrorResponse(error=str(e))
+        error_body = ErrorResponse(error=str(e))
         return {
             'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps(error_response.dict())
+            'headers': JSON_HEADERS,
+            'body': error_body.model_dump_json()
         }
 
     except Exception as e:
-        error_response = ErrorResponse(
+        error_body = ErrorResponse(
             error="Internal server error",
             detail=str(e)
         )
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps(error_response.dict())
+            'headers': JSON_HEADERS,
+            'body': error_body.model_dump_json()
         }
+
+
+def register(body: Dict[str, Any]) -> Dict[str, Any]:
+    """POST /auth/register"""
+    user_create = UserCreate.model_validate(body)
+    token = auth_service.register_user(user_create)
+
+    response = SuccessResponse(
+        data=token,
+        message="User registered successfully"
+    )
+
+    return {
+        'statusCode': 201,
+        'headers': JSON_HEADERS,
+        'body': response.model_dump_json()
+    }
+
+
+def login(body: Dict[str, Any]) -> Dict[str, Any]:
+    """POST /auth/login"""
+    user_login = UserLogin.model_validate(body)
+    token = auth_service.login_user(user_login)
+
+    response = SuccessResponse(
+        data=token,
+        message="Login successful"
+    )
+
+    return {
+        'statusCode': 200,
+        'headers': JSON_HEADERS,
+        'body': response.model_dump_json()
+    }
+
+
+# Routes keyed on (method, API Gateway resource template)
+_ROUTES = {
+    ('POST', '/auth/register'): register,
+    ('POST', '/auth/login'): login,
+}
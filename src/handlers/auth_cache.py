@@ -0,0 +1,82 @@
+"""
+Verified-JWT cache shared by the authorizer and any handler that has to
+decode the bearer token itself
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import jwt
+
+# Verified tokens are cached per warm container, keyed by the token's SHA-256
+# so raw tokens are never held. Entries expire after TOKEN_CACHE_TTL seconds
+# or at the token's own exp, whichever comes first
+TOKEN_CACHE_TTL = 30
+TOKEN_CACHE_MAX_SIZE = 10_000
+
+# Read and encoded once per container rather than on every request
+_SECRET_KEY = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production').encode()
+
+_token_cache: 'OrderedDict[bytes, Tuple[float, str, str]]' = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _get_cached_claims(key: bytes) -> Optional[Tuple[str, str]]:
+    """Return (user_id, email) for a still-valid cached token"""
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, user_id, email = entry
+        if expires_at <= time.time():
+            del _token_cache[key]
+            return None
+
+        _token_cache.move_to_end(key)
+        return user_id, email
+
+
+def _cache_claims(key: bytes, payload: Dict[str, Any], user_id: str, email: str) -> None:
+    """Remember a verified token, evicting the least recently used entries"""
+    now = time.time()
+    expires_at = now + TOKEN_CACHE_TTL
+    if payload.get('exp') is not None:
+        expires_at = min(expires_at, float(payload['exp']))
+    if expires_at <= now:
+        return
+
+    with _token_cache_lock:
+        _token_cache[key] = (expires_at, user_id, email)
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+            _token_cache.popitem(last=False)
+
+
+def verify_token(token: str) -> Tuple[str, str]:
+    """
+    Verify an HS256 token, memoized per warm container
+
+    Returns:
+        Tuple of (user_id, email)
+
+    Raises:
+        jwt.PyJWTError or ValueError if the token is invalid
+    """
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = _get_cached_claims(cache_key)
+    if cached:
+        return cached
+
+    payload = jwt.decode(token, _SECRET_KEY, algorithms=["HS256"])
+
+    user_id = payload.get('user_id')
+    email = payload.get('email')
+
+    if not user_id or not email:
+        raise ValueError("Invalid token payload")
+
+    _cache_claims(cache_key, payload, user_id, email)
+    return user_id, email
@@ -1,36 +1,35 @@
+import logging
 import os
 from typing import Dict, Any
-from jose import jwt, JWTError
+from jwt import PyJWTError as JWTError
+
+from handlers.auth_cache import verify_token
+
+logger = logging.getLogger()
+# The authorizer runs on every API call, so stay quiet unless asked
+logger.setLevel(os.environ.get('LOG_LEVEL', 'WARNING'))
+
+
+def _authorization_header(headers: Dict[str, str]) -> str:
+    """Case-insensitive Authorization lookup, trying the usual casings first"""
+    token = headers.get('Authorization') or headers.get('authorization')
+    if token is None:
+        token = next((v for k, v in headers.items() if k.lower() == 'authorization'), None)
+    return token or ''
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Lambda authorizer for JWT validation"""
     try:
-        # Extract token from Authorization header (case-insensitive)
-        headers = event.get('headers', {})
+        token = _authorization_header(event.get('headers') or {})
 
-        # Try different header casings
-        token = (headers.get('Authorization') or
-                headers.get('authorization') or
-                headers.get('AUTHORIZATION') or '')
-
-        print(f"Token received: {token[:20]}..." if token else "No token found")
-        print(f"Available headers: {list(headers.keys())}")
-
-        if token.startswith('Bearer ') or token.startswith('bearer '):
+        if token[:7].lower() == 'bearer ':
             token = token[7:]
         elif not token:
             raise ValueError("No authorization token provided")
 
-        # Verify token
-        secret_key = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production')
-        payload = jwt.decode(token, secret_key, algorithms=["HS256"])
-
-        user_id = payload.get('user_id')
-        email = payload.get('email')
-
-        if not user_id or not email:
-            raise ValueError("Invalid token payload")
+        # Verify token, skipping the decode for recently verified tokens
+        user_id, email = verify_token(token)
 
         # Return allow policy with wildcard resource for better caching
         # Extract API Gateway ARN base (without specific method/path)
@@ -40,7 +39,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         arn_parts = method_arn.split('/')
         api_gateway_arn = '/'.join(arn_parts[:2]) + '/*/*'
 
-        print(f"Allowing access for user {user_id} to {api_gateway_arn}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Allowing access for user %s to %s", user_id, api_gateway_arn)
 
         # Return allow policy
         return {
@@ -62,7 +62,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
 
     except (JWTError, ValueError) as e:
-        print(f"Authorization failed: {str(e)}")
+        logger.warning("Authorization failed: %s", e)
         # Return deny policy
         return {
             'principalId': 'unauthorized',
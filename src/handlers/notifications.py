@@ -1,19 +1,66 @@
-import json
 import logging
+import os
+from types import MappingProxyType
 from typing import Dict, Any
 from models.notification import (
     NotificationPreferencesUpdate,
     TestEmailRequest,
     SendNotificationRequest,
     NotificationHistoryQuery,
+    NotificationHistoryResponse,
     EmailVerificationRequest
 )
 from models.response import SuccessResponse, ErrorResponse
-from services.notification_service import NotificationService
-from services.auth_service import AuthService
+from handlers._common import (
+    JSON_HEADERS, PREFLIGHT_RESPONSE, UNAUTHORIZED_RESPONSE, NOT_FOUND_RESPONSE, error_response,
+    PAYLOAD_TOO_LARGE_RESPONSE, body_too_large, clamp_int, parse_body
+)
 
 logger = logging.getLogger(__name__)
 
+# The authorizer has already verified the token and put user_id in the
+# request context; re-decoding it here is opt-in for setups without one
+_ALLOW_TOKEN_FALLBACK = os.environ.get('ALLOW_TOKEN_FALLBACK') == '1'
+
+
+# Sample payloads for /notifications/test. Read-only views, since they're
+# shared across requests and the services copy what they need
+_TEST_DAILY_DIGEST = MappingProxyType({
+    'user_name': 'Test User',
+    'total_value': '$50,000.00',
+    'total_change_24h': '+2.5%',
+    'crypto_value': '$30,000.00',
+    'stock_value': '$20,000.00',
+    'top_performer': 'Bitcoin (BTC)',
+    'top_performer_change': '+5.2%',
+    'date': 'Today'
+})
+
+_TEST_PRICE_ALERT = MappingProxyType({
+    'asset_name': 'Bitcoin (BTC)',
+    'current_price': 50000.00,
+    'alert_type': 'crossed above',
+    'threshold': 48000.00
+})
+
+_TEST_MILESTONE = MappingProxyType({
+    'milestone_type': 'portfolio_value',
+    'milestone_value': 100000
+})
+
+_TEST_TRANSACTION_CONFIRMATION = MappingProxyType({
+    'transaction_type': 'BUY',
+    'asset_name': 'Bitcoin (BTC)',
+    'quantity': 0.5,
+    'price': 50000.00
+})
+
+
+def _notification_service():
+    """Import the notification service (boto3, SMTP) on first use"""
+    from services.notification_service import notification_service
+    return notification_service
+
 
 def get_user_id_from_event(event: Dict[str, Any]) -> str:
     """Extract user ID from authorization context"""
@@ -22,254 +69,238 @@ def get_user_id_from_event(event: Dict[str, Any]) -> str:
     authorizer = request_context.get('authorizer', {})
     user_id = authorizer.get('user_id')
 
-    if not user_id:
+    if not user_id and _ALLOW_TOKEN_FALLBACK:
         # Fallback: try to decode from Authorization header
-        headers = event.get('headers', {})
-        auth_header = headers.get('Authorization', '')
-        if auth_header.startswith('Bearer '):
-            token = auth_header.replace('Bearer ', '')
-            # Decode token to get user_id
-            auth_service = AuthService()
-            token_data = auth_service.verify_token(token)
-            user_id = token_data.user_id if token_data else None
+        headers = event.get('headers') or {}
+        auth_header = headers.get('Authorization') or headers.get('authorization') or ''
+        if auth_header[:7].lower() == 'bearer ':
+            # Shares the authorizer's verified-token cache
+            from jwt import PyJWTError
+            from handlers.auth_cache import verify_token
+
+            try:
+                user_id, _ = verify_token(auth_header[7:])
+            except (PyJWTError, ValueError):
+                user_id = None
 
     return user_id
 
 
+def _endpoint(event: Dict[str, Any]) -> str:
+    """
+    Return the endpoint name under /notifications, e.g. 'preferences'
+
+    The function is deployed behind a single /notifications/{proxy+} event,
+    so the resource template is the same for every request; the proxied path
+    carries the endpoint. Falls back to the last raw path segment.
+    """
+    proxy = (event.get('pathParameters') or {}).get('proxy')
+    if proxy:
+        return proxy.strip('/')
+    return event.get('path', '').rstrip('/').rsplit('/', 1)[-1]
+
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Lambda handler for notification endpoints"""
     try:
-        path = event.get('path', '')
         http_method = event.get('httpMethod', '')
 
         # CORS preflight
         if http_method == 'OPTIONS':
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-                    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                    'Access-Control-Max-Age': '600',
-                },
-                'body': ''
-            }
+            return PREFLIGHT_RESPONSE
 
         # Get user ID from auth
         user_id = get_user_id_from_event(event)
         if not user_id:
-            return {
-                'statusCode': 401,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps({'error': 'Unauthorized'})
-            }
-
-        body = json.loads(event.get('body', '{}')) if event.get('body') else {}
-        notification_service = NotificationService()
-
-        # GET /notifications/preferences - Get user notification preferences
-        if path.endswith('/notifications/preferences') and http_method == 'GET':
-            preferences = notification_service.get_user_preferences(user_id)
-
-            if not preferences:
-                # Create default preferences
-                # Get user email from database
-                preferences = notification_service.create_default_preferences(user_id, "user@example.com")
-
-            response = SuccessResponse(
-                data=preferences.dict(),
-                message="Preferences retrieved successfully"
-            )
-
-            return {
-                'statusCode': 200,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps(response.dict(), default=str)
-            }
-
-        # POST /notifications/preferences - Update preferences
-        elif path.endswith('/notifications/preferences') and http_method == 'POST':
-            updates = NotificationPreferencesUpdate(**body)
-            preferences = notification_service.update_user_preferences(user_id, updates)
-
-            if not preferences:
-                return {
-                    'statusCode': 404,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps({'error': 'Preferences not found'})
-                }
-
-            response = SuccessResponse(
-                data=preferences.dict(),
-                message="Preferences updated successfully"
-            )
-
-            return {
-                'statusCode': 200,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps(response.dict(), default=str)
-            }
-
-        # POST /notifications/test - Send test email
-        elif path.endswith('/notifications/test') and http_method == 'POST':
-            test_request = TestEmailRequest(**body)
-
-            # Send test notification based on type
-            if test_request.notification_type == 'daily_digest':
-                test_data = {
-                    'user_name': 'Test User',
-                    'total_value': '$50,000.00',
-                    'total_change_24h': '+2.5%',
-                    'crypto_value': '$30,000.00',
-                    'stock_value': '$20,000.00',
-                    'top_performer': 'Bitcoin (BTC)',
-                    'top_performer_change': '+5.2%',
-                    'date': 'Today'
-                }
-                success = notification_service.send_daily_digest(user_id, test_data)
-            elif test_request.notification_type == 'price_alert':
-                success = notification_service.send_price_alert(
-                    user_id=user_id,
-                    asset_name='Bitcoin (BTC)',
-                    current_price=50000.00,
-                    alert_type='crossed above',
-                    threshold=48000.00
-                )
-            elif test_request.notification_type == 'milestone':
-                success = notification_service.send_milestone_notification(
-                    user_id=user_id,
-                    milestone_type='portfolio_value',
-                    milestone_value=100000
-                )
-            elif test_request.notification_type == 'transaction_confirmation':
-                success = notification_service.send_transaction_confirmation(
-                    user_id=user_id,
-                    transaction_type='BUY',
-                    asset_name='Bitcoin (BTC)',
-                    quantity=0.5,
-                    price=50000.00
-                )
-            elif test_request.notification_type == 'welcome':
-                preferences = notification_service.get_user_preferences(user_id)
-                success = notification_service.send_welcome_email(
-                    user_id=user_id,
-                    full_name='Test User',
-                    email=preferences.email if preferences else 'test@example.com'
-                )
-            else:
-                return {
-                    'statusCode': 400,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps({'error': f'Unsupported test notification type: {test_request.notification_type}'})
-                }
-
-            if success:
-                response = SuccessResponse(
-                    data={'sent': True, 'notification_type': test_request.notification_type},
-                    message="Test email sent successfully"
-                )
-                return {
-                    'statusCode': 200,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps(response.dict())
-                }
-            else:
-                return {
-                    'statusCode': 500,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps({'error': 'Failed to send test email'})
-                }
-
-        # POST /notifications/send - Send specific notification
-        elif path.endswith('/notifications/send') and http_method == 'POST':
-            send_request = SendNotificationRequest(**body)
-            target_user_id = send_request.user_id or user_id
-
-            # For now, just return success
-            # In production, this would trigger the appropriate notification
-            response = SuccessResponse(
-                data={'notification_type': send_request.notification_type, 'queued': True},
-                message="Notification queued successfully"
-            )
-
-            return {
-                'statusCode': 200,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps(response.dict())
-            }
-
-        # GET /notifications/history - Get notification history
-        elif path.endswith('/notifications/history') and http_method == 'GET':
-            query_params = event.get('queryStringParameters', {}) or {}
-
-            limit = int(query_params.get('limit', 50))
-            offset = int(query_params.get('offset', 0))
-            notification_type = query_params.get('type')
-
-            notifications = notification_service.get_notification_history(
-                user_id=user_id,
-                notification_type=notification_type,
-                limit=limit,
-                offset=offset
-            )
-
-            response = SuccessResponse(
-                data={
-                    'notifications': [n.dict() for n in notifications],
-                    'count': len(notifications),
-                    'limit': limit,
-                    'offset': offset
-                },
-                message="Notification history retrieved successfully"
-            )
-
-            return {
-                'statusCode': 200,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps(response.dict(), default=str)
-            }
-
-        # GET /notifications/config - Get email configuration status
-        elif path.endswith('/notifications/config') and http_method == 'GET':
-            from services.email_service import EmailService
-            email_service = EmailService()
-            config = email_service.validate_email_config()
-
-            response = SuccessResponse(
-                data=config,
-                message="Email configuration retrieved"
-            )
-
-            return {
-                'statusCode': 200,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps(response.dict())
-            }
-
-        else:
-            return {
-                'statusCode': 404,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps({'error': 'Not found'})
-            }
+            return UNAUTHORIZED_RESPONSE
+
+        route = _ROUTES.get((http_method, _endpoint(event)))
+
+        if not route:
+            return NOT_FOUND_RESPONSE
+
+        if body_too_large(event):
+            return PAYLOAD_TOO_LARGE_RESPONSE
+
+        return route(event, parse_body(event), user_id)
 
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
-        error_response = ErrorResponse(error=str(e))
+        error_body = ErrorResponse(error=str(e))
         return {
             'statusCode': 400,
-            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(error_response.dict())
+            'headers': JSON_HEADERS,
+            'body': error_body.model_dump_json()
         }
 
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-        error_response = ErrorResponse(
+        error_body = ErrorResponse(
             error="Internal server error",
             detail=str(e)
         )
         return {
             'statusCode': 500,
-            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(error_response.dict())
+            'headers': JSON_HEADERS,
+            'body': error_body.model_dump_json()
+        }
+
+
+def get_preferences(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """GET /notifications/preferences - Get user notification preferences"""
+    preferences = _notification_service().get_user_preferences(user_id)
+
+    if not preferences:
+        # Create default preferences
+        # Get user email from database
+        preferences = _notification_service().create_default_preferences(user_id, "user@example.com")
+
+    response = SuccessResponse(
+        data=preferences,
+        message="Preferences retrieved successfully"
+    )
+
+    return {
+        'statusCode': 200,
+        'headers': JSON_HEADERS,
+        'body': response.model_dump_json()
+    }
+
+
+def update_preferences(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """POST /notifications/preferences - Update preferences"""
+    updates = NotificationPreferencesUpdate.model_validate(body)
+    preferences = _notification_service().update_user_preferences(user_id, updates)
+
+    if not preferences:
+        return error_response(404, 'Preferences not found')
+
+    response = SuccessResponse(
+        data=preferences,
+        message="Preferences updated successfully"
+    )
+
+    return {
+        'statusCode': 200,
+        'headers': JSON_HEADERS,
+        'body': response.model_dump_json()
+    }
+
+
+def send_test(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """POST /notifications/test - Send test email"""
+    test_request = TestEmailRequest.model_validate(body)
+    service = _notification_service()
+
+    # Send test notification based on type
+    if test_request.notification_type == 'daily_digest':
+        success = service.send_daily_digest(user_id, _TEST_DAILY_DIGEST)
+    elif test_request.notification_type == 'price_alert':
+        success = service.send_price_alert(user_id=user_id, **_TEST_PRICE_ALERT)
+    elif test_request.notification_type == 'milestone':
+        success = service.send_milestone_notification(user_id=user_id, **_TEST_MILESTONE)
+    elif test_request.notification_type == 'transaction_confirmation':
+        success = service.send_transaction_confirmation(
+            user_id=user_id, **_TEST_TRANSACTION_CONFIRMATION
+        )
+    elif test_request.notification_type == 'welcome':
+        preferences = service.get_user_preferences(user_id)
+        success = service.send_welcome_email(
+            user_id=user_id,
+            full_name='Test User',
+            email=preferences.email if preferences else 'test@example.com'
+        )
+    else:
+        return error_response(400, f'Unsupported test notification type: {test_request.notification_type}')
+
+    if success:
+        response = SuccessResponse(
+            data={'sent': True, 'notification_type': test_request.notification_type},
+            message="Test email sent successfully"
+        )
+        return {
+            'statusCode': 200,
+            'headers': JSON_HEADERS,
+            'body': response.model_dump_json()
         }
+    else:
+        return error_response(500, 'Failed to send test email')
+
+
+def send_notification(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """POST /notifications/send - Send specific notification"""
+    send_request = SendNotificationRequest.model_validate(body)
+    target_user_id = send_request.user_id or user_id
+
+    # For now, just return success
+    # In production, this would trigger the appropriate notification
+    response = SuccessResponse(
+        data={'notification_type': send_request.notification_type, 'queued': True},
+        message="Notification queued successfully"
+    )
+
+    return {
+        'statusCode': 200,
+        'headers': JSON_HEADERS,
+        'body': response.model_dump_json()
+    }
+
+
+def get_history(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """GET /notifications/history - Get notification history"""
+    query_params = event.get('queryStringParameters', {}) or {}
+
+    limit = clamp_int(query_params.get('limit'), 50)
+    offset = int(query_params.get('offset', 0))
+    notification_type = query_params.get('type')
+
+    notifications = _notification_service().get_notification_history(
+        user_id=user_id,
+        notification_type=notification_type,
+        limit=limit,
+        offset=offset
+    )
+
+    # Kept as models so model_dump_json serializes the list in one pass
+    response = SuccessResponse(
+        data=NotificationHistoryResponse(
+            notifications=notifications,
+            count=len(notifications),
+            limit=limit,
+            offset=offset
+        ),
+        message="Notification history retrieved successfully"
+    )
+
+    return {
+        'statusCode': 200,
+        'headers': JSON_HEADERS,
+        'body': response.model_dump_json()
+    }
+
+
+def get_config(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """GET /notifications/config - Get email configuration status"""
+    config = _notification_service().email_service.validate_email_config()
+
+    response = SuccessResponse(
+        data=config,
+        message="Email configuration retrieved"
+    )
+
+    return {
+        'statusCode': 200,
+        'headers': JSON_HEADERS,
+        'body': response.model_dump_json()
+    }
+
+
+# Routes keyed on (method, endpoint under /notifications); see _endpoint
+_ROUTES = {
+    ('GET', 'preferences'): get_preferences,
+    ('POST', 'preferences'): update_preferences,
+    ('POST', 'test'): send_test,
+    ('POST', 'send'): send_notification,
+    ('GET', 'history'): get_history,
+    ('GET', 'config'): get_config,
+}
@@ -1,180 +1,132 @@
-import json
 from typing import Dict, Any
 from models.portfolio import AssetCreate, AssetUpdate, AssetType
 from models.response import SuccessResponse, ErrorResponse
-from services.portfolio_service import PortfolioService
+from services.portfolio_service import portfolio_service
+from handlers._common import (
+    JSON_HEADERS, PREFLIGHT_RESPONSE, UNAUTHORIZED_RESPONSE, NOT_FOUND_RESPONSE, parse_body,
+    PAYLOAD_TOO_LARGE_RESPONSE, body_too_large
+)
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Lambda handler for portfolio endpoints"""
     try:
-        path = event.get('path', '')
         http_method = event.get('httpMethod', '')
 
         # Handle OPTIONS request for CORS preflight
         if http_method == 'OPTIONS':
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-                    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token',
-                    'Access-Control-Max-Age': '600',
-                },
-                'body': ''
-            }
-
-        body = json.loads(event.get('body', '{}')) if event.get('body') else {}
+            return PREFLIGHT_RESPONSE
 
         # Get user_id from authorizer context
         user_id = event.get('requestContext', {}).get('authorizer', {}).get('user_id')
 
         if not user_id:
-            return {
-                'statusCode': 401,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Unauthorized'})
-            }
-
-        portfolio_service = PortfolioService()
-
-        # GET /portfolio/crypto
-        if path.endswith('/portfolio/crypto') and http_method == 'GET':
-            portfolio = portfolio_service.get_portfolio(user_id, AssetType.CRYPTO)
-            response = SuccessResponse(data=portfolio.dict())
-
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps(response.dict(), default=str)
-            }
-
-        # GET /portfolio/stocks
-        elif path.endswith('/portfolio/stocks') and http_method == 'GET':
-            portfolio = portfolio_service.get_portfolio(user_id, AssetType.STOCK)
-            response = SuccessResponse(data=portfolio.dict())
-
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps(response.dict(), default=str)
-            }
-
-        # GET /portfolio/summary
-        elif path.endswith('/portfolio/summary') and http_method == 'GET':
-            summary = portfolio_service.get_portfolio_summary(user_id)
-            response = SuccessResponse(data=summary.dict())
-
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps(response.dict(), default=str)
-            }
-
-        # POST /portfolio/assets
-        elif path.endswith('/portfolio/assets') and http_method == 'POST':
-            asset_create = AssetCreate(**body)
-            asset = portfolio_service.add_asset(user_id, asset_create)
-            response = SuccessResponse(
-                data=asset.dict(),
-                message="Asset added successfully"
-            )
-
-            return {
-                'statusCode': 201,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps(response.dict(), default=str)
-            }
-
-        # PUT /portfolio/assets/{asset_id}
-        elif '/portfolio/assets/' in path and http_method == 'PUT':
-            asset_id = event.get('pathParameters', {}).get('asset_id')
-            if not asset_id:
-                raise ValueError("Asset ID is required")
-
-            asset_update = AssetUpdate(**body)
-            asset = portfolio_service.update_asset(user_id, asset_id, asset_update)
-            response = SuccessResponse(
-                data=asset.dict(),
-                message="Asset updated successfully"
-            )
-
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps(response.dict(), default=str)
-            }
-
-        # DELETE /portfolio/assets/{asset_id}
-        elif '/portfolio/assets/' in path and http_method == 'DELETE':
-            asset_id = event.get('pathParameters', {}).get('asset_id')
-            if not asset_id:
-                raise ValueError("Asset ID is required")
-
-            portfolio_service.delete_asset(user_id, asset_id)
-            response = SuccessResponse(
-                data=None,
-                message="Asset deleted successfully"
-            )
-
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps(response.dict(), default=str)
-            }
-
-        else:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Not found'})
-            }
+            return UNAUTHORIZED_RESPONSE
+
+        # API Gateway's resource template; fall back to the raw path
+        resource = event.get('resource') or event.get('path', '')
+        route = _ROUTES.get((http_method, resource))
+
+        if not route:
+            return NOT_FOUND_RESPONSE
+
+        if body_too_large(event):
+            return PAYLOAD_TOO_LARGE_RESPONSE
+
+        return route(event, parse_body(event), user_id)
 
     except ValueError as e:
-        error_response = ErrorResponse(error=str(e))
+        error_body = ErrorResponse(error=str(e))
         return {
             'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps(error_response.dict())
+            'headers': JSON_HEADERS,
+            'body': error_body.model_dump_json()
         }
 
     except Exception as e:
-        error_response = ErrorResponse(
+        error_body = ErrorResponse(
             error="Internal server error",
             detail=str(e)
         )
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps(error_response.dict())
+            'headers': JSON_HEADERS,
+            'body': error_body.model_dump_json()
         }
+
+
+def _success(status: int, response: SuccessResponse) -> Dict[str, Any]:
+    """Wrap a SuccessResponse in an API Gateway response"""
+    return {
+        'statusCode': status,
+        'headers': JSON_HEADERS,
+        'body': response.model_dump_json()
+    }
+
+
+def _asset_id(event: Dict[str, Any]) -> str:
+    """Read the asset_id path parameter"""
+    asset_id = (event.get('pathParameters') or {}).get('asset_id')
+    if not asset_id:
+        raise ValueError("Asset ID is required")
+    return asset_id
+
+
+def get_crypto(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """GET /portfolio/crypto"""
+    portfolio = portfolio_service.get_portfolio(user_id, AssetType.CRYPTO)
+    return _success(200, SuccessResponse(data=portfolio))
+
+
+def get_stocks(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """GET /portfolio/stocks"""
+    portfolio = portfolio_service.get_portfolio(user_id, AssetType.STOCK)
+    return _success(200, SuccessResponse(data=portfolio))
+
+
+def get_summary(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """GET /portfolio/summary"""
+    summary = portfolio_service.get_portfolio_summary(user_id)
+    return _success(200, SuccessResponse(data=summary))
+
+
+def add_asset(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """POST /portfolio/assets"""
+    asset_create = AssetCreate.model_validate(body)
+    asset = portfolio_service.add_asset(user_id, asset_create)
+    return _success(201, SuccessResponse(
+        data=asset,
+        message="Asset added successfully"
+    ))
+
+
+def update_asset(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """PUT /portfolio/assets/{asset_id}"""
+    asset_id = _asset_id(event)
+    asset_update = AssetUpdate.model_validate(body)
+    asset = portfolio_service.update_asset(user_id, asset_id, asset_update)
+    return _success(200, SuccessResponse(
+        data=asset,
+        message="Asset updated successfully"
+    ))
+
+
+def delete_asset(event: Dict[str, Any], body: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """DELETE /portfolio/assets/{asset_id}"""
+    asset_id = _asset_id(event)
+    portfolio_service.delete_asset(user_id, asset_id)
+    return _success(200, SuccessResponse(
+        data=None,
+        message="Asset deleted successfully"
+    ))
+
+
+# Routes keyed on (method, API Gateway resource template)
+_ROUTES = {
+    ('GET', '/portfolio/crypto'): get_crypto,
+    ('GET', '/portfolio/stocks'): get_stocks,
+    ('GET', '/portfolio/summary'): get_summary,
+    ('POST', '/portfolio/assets'): add_asset,
+    ('PUT', '/portfolio/assets/{asset_id}'): update_asset,
+    ('DELETE', '/portfolio/assets/{asset_id}'): delete_asset,
+}
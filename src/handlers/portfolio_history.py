@@ -1,25 +1,59 @@
-import json
 import logging
-from typing import Dict, Any
-from datetime import datetime
-from decimal import Decimal
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
 from models.portfolio_history import HistoryRequest, SnapshotRequest
-from services.portfolio_history_service import PortfolioHistoryService
+from services.portfolio_history_service import portfolio_history_service
 from models.response import SuccessResponse, ErrorResponse
+from handlers._common import (
+    JSON_HEADERS, PREFLIGHT_RESPONSE, UNAUTHORIZED_RESPONSE, NOT_FOUND_RESPONSE, dumps, parse_body
+)
 
 logger = logging.getLogger(__name__)
 
+# Serialized history bodies are cached per warm container, keyed by
+# (user_id, period, portfolio_type, include_benchmarks, layout): chart
+# refreshes repeat the same query, and a short TTL keeps the data close to live
+HISTORY_CACHE_TTL = 60
+HISTORY_CACHE_MAX_SIZE = 512
+
+_HistoryKey = Tuple[str, str, str, bool, str]
+
+_history_cache: 'OrderedDict[_HistoryKey, Tuple[float, str]]' = OrderedDict()
+
+
+def _get_cached_history(key: _HistoryKey) -> Optional[str]:
+    """Return a still-fresh cached response body"""
+    entry = _history_cache.get(key)
+    if entry is None:
+        return None
+
+    expires_at, body = entry
+    if expires_at <= time.time():
+        del _history_cache[key]
+        return None
+
+    _history_cache.move_to_end(key)
+    return body
+
+
+def _cache_history(key: _HistoryKey, body: str) -> None:
+    """Remember a response body, evicting the least recently used entries"""
+    _history_cache[key] = (time.time() + HISTORY_CACHE_TTL, body)
+    _history_cache.move_to_end(key)
+    while len(_history_cache) > HISTORY_CACHE_MAX_SIZE:
+        _history_cache.popitem(last=False)
 
-class DateTimeEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles datetime and Decimal objects"""
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
 
-portfolio_history_service = PortfolioHistoryService()
+def _invalidate_history(user_id: str) -> None:
+    """Drop every cached history view for a user"""
+    for key in [k for k in _history_cache if k[0] == user_id]:
+        del _history_cache[key]
+
+
+# Runs during container init, so the first request finds a live connection
+portfolio_history_service.warm()
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -28,61 +62,33 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Routes requests to appropriate handlers
     """
     try:
-        path = event.get('path', '')
         http_method = event.get('httpMethod', '')
 
         # Handle OPTIONS request for CORS preflight
         if http_method == 'OPTIONS':
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-                    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token',
-                    'Access-Control-Max-Age': '600',
-                },
-                'body': ''
-            }
+            return PREFLIGHT_RESPONSE
 
         # Get user_id from authorizer context
         user_id = event.get('requestContext', {}).get('authorizer', {}).get('user_id')
 
         if not user_id:
-            return {
-                'statusCode': 401,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Unauthorized'})
-            }
-
-        # Route to appropriate handler
-        if path.endswith('/history') and http_method == 'GET':
-            return get_portfolio_history(event, user_id)
-        elif path.endswith('/history/snapshot') and http_method == 'POST':
-            return create_snapshot(event, user_id)
-        elif path.endswith('/history/snapshots') and http_method == 'GET':
-            return list_snapshots(event, user_id)
-        else:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Not Found'})
-            }
+            return UNAUTHORIZED_RESPONSE
+
+        # API Gateway's resource template; fall back to the raw path
+        resource = event.get('resource') or event.get('path', '')
+        route = _ROUTES.get((http_method, resource))
+
+        if not route:
+            return NOT_FOUND_RESPONSE
+
+        return route(event, user_id)
 
     except Exception as e:
         logger.error(f"Error in portfolio history handler: {str(e)}")
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
+            'headers': JSON_HEADERS,
+            'body': dumps({'error': str(e)})
         }
 
 
@@ -95,48 +101,45 @@ def get_portfolio_history(event: Dict[str, Any], user_id: str) -> Dict[str, Any]
     - period: 24H, 7D, 30D, 90D, 1Y, ALL (default: 30D)
     - portfolio_type: crypto, stock, combined (default: combined)
     - include_benchmarks: true/false (default: false)
+    - layout: points or columns (default: points)
     """
     try:
         query_params = event.get('queryStringParameters') or {}
 
-        # Parse request parameters
-        request = HistoryRequest(
-            period=query_params.get('period', '30D'),
-            portfolio_type=query_params.get('portfolio_type', 'combined'),
-            include_benchmarks=query_params.get('include_benchmarks', 'false').lower() == 'true'
-        )
+        # Parse request parameters; pydantic coerces 'true'/'false' to bool
+        request = HistoryRequest.model_validate(query_params)
 
-        # Get history data
-        history = portfolio_history_service.get_portfolio_history(user_id, request)
+        cache_key = (user_id, request.period, request.portfolio_type, request.include_benchmarks, request.layout)
+        body = _get_cached_history(cache_key)
+
+        if body is None:
+            # Get history data
+            history = portfolio_history_service.get_portfolio_history(user_id, request)
+            if request.layout == 'columns':
+                history = history.to_columns()
+            # Straight from pydantic-core to JSON, no intermediate dict
+            body = '{"success":true,"data":%s}' % history.model_dump_json()
+            _cache_history(cache_key, body)
 
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'success': True, 'data': history.dict()}, cls=DateTimeEncoder)
+            'headers': JSON_HEADERS,
+            'body': body
         }
 
     except ValueError as e:
         logger.error(f"Invalid parameters: {str(e)}")
         return {
             'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'success': False, 'error': f"Invalid parameters: {str(e)}"})
+            'headers': JSON_HEADERS,
+            'body': dumps({'success': False, 'error': f"Invalid parameters: {str(e)}"})
         }
     except Exception as e:
         logger.error(f"Error getting portfolio history: {str(e)}")
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'success': False, 'error': str(e)})
+            'headers': JSON_HEADERS,
+            'body': dumps({'success': False, 'error': str(e)})
         }
 
 
@@ -151,44 +154,32 @@ def create_snapshot(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     }
     """
     try:
-        body = json.loads(event.get('body', '{}'))
-
         # Parse request
-        request = SnapshotRequest(
-            portfolio_type=body.get('portfolio_type', 'combined')
-        )
+        request = SnapshotRequest.model_validate(parse_body(event))
 
         # Create snapshot
         result = portfolio_history_service.create_snapshot(user_id, request.portfolio_type)
+        _invalidate_history(user_id)
 
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'success': True, 'data': result, 'message': 'Snapshot created successfully'}, cls=DateTimeEncoder)
+            'headers': JSON_HEADERS,
+            'body': dumps({'success': True, 'data': result, 'message': 'Snapshot created successfully'})
         }
 
     except ValueError as e:
         logger.error(f"Invalid parameters: {str(e)}")
         return {
             'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'success': False, 'error': f"Invalid parameters: {str(e)}"})
+            'headers': JSON_HEADERS,
+            'body': dumps({'success': False, 'error': f"Invalid parameters: {str(e)}"})
         }
     except Exception as e:
         logger.error(f"Error creating snapshot: {str(e)}")
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'success': False, 'error': str(e)})
+            'headers': JSON_HEADERS,
+            'body': dumps({'success': False, 'error': str(e)})
         }
 
 
@@ -210,11 +201,8 @@ def list_snapshots(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         # In production, you'd implement a proper snapshot listing
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({
+            'headers': JSON_HEADERS,
+            'body': dumps({
                 'success': True,
                 'data': {
                     'message': 'Snapshots list endpoint',
@@ -229,14 +217,18 @@ def list_snapshots(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         logger.error(f"Error listing snapshots: {str(e)}")
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'success': False, 'error': str(e)})
+            'headers': JSON_HEADERS,
+            'body': dumps({'success': False, 'error': str(e)})
         }
 
 
+_ROUTES = {
+    ('GET', '/portfolio/history'): get_portfolio_history,
+    ('POST', '/portfolio/history/snapshot'): create_snapshot,
+    ('GET', '/portfolio/history/snapshots'): list_snapshots,
+}
+
+
 # Scheduled job handler
 def daily_snapshot_job(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -250,12 +242,12 @@ def daily_snapshot_job(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         return {
             'statusCode': 200,
-            'body': json.dumps(result)
+            'body': dumps(result)
         }
 
     except Exception as e:
         logger.error(f"Error in daily snapshot job: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
+            'body': dumps({'error': str(e)})
         }
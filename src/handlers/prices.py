@@ -1,9 +1,9 @@
-import json
 from typing import Dict, Any
 from datetime import datetime
 from models.portfolio import PriceRequest
 from models.response import SuccessResponse, ErrorResponse
-from services.price_service import PriceService
+from services.price_service import price_service
+from handlers._common import JSON_HEADERS, PREFLIGHT_RESPONSE, NOT_FOUND_RESPONSE, parse_body
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -13,36 +13,25 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         # Handle OPTIONS request for CORS preflight
         if http_method == 'OPTIONS':
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-                    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token',
-                    'Access-Control-Max-Age': '600',
-                },
-                'body': ''
-            }
-
-        body = json.loads(event.get('body', '{}'))
+            return PREFLIGHT_RESPONSE
 
         # POST /prices
         if http_method == 'POST':
-            price_request = PriceRequest(**body)
-            price_service = PriceService()
+            price_request = PriceRequest.model_validate(parse_body(event))
 
             prices = price_service.get_prices(
                 price_request.symbols,
                 price_request.asset_type.value
             )
 
-            # Format response
+            # Format response; every price in the batch shares one fetch time
+            now_iso = datetime.utcnow().isoformat()
             price_responses = [
                 {
                     'symbol': symbol,
                     'price': price,
                     'currency': 'USD',
-                    'timestamp': datetime.utcnow().isoformat()
+                    'timestamp': now_iso
                 }
                 for symbol, price in prices.items()
             ]
@@ -51,44 +40,28 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
             return {
                 'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps(response.dict(), default=str)
+                'headers': JSON_HEADERS,
+                'body': response.model_dump_json()
             }
 
         else:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Not found'})
-            }
+            return NOT_FOUND_RESPONSE
 
     except ValueError as e:
-        error_response = ErrorResponse(error=str(e))
+        error_body = ErrorResponse(error=str(e))
         return {
             'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps(error_response.dict())
+            'headers': JSON_HEADERS,
+            'body': error_body.model_dump_json()
         }
 
     except Exception as e:
-        error_response = ErrorResponse(
+        error_body = ErrorResponse(
             error="Internal server error",
             detail=str(e)
         )
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps(error_response.dict())
+            'headers': JSON_HEADERS,
+            'body': error_body.model_dump_json()
         }
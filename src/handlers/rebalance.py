@@ -3,118 +3,90 @@ Portfolio Rebalancing API Handler
 """
 import json
 import logging
+import re
+import math
 from typing import Dict, Any
-from decimal import Decimal
 
 from services.rebalance_service import rebalance_service
+from handlers._common import (
+    PREFLIGHT_RESPONSE, UNAUTHORIZED_RESPONSE, NOT_FOUND_RESPONSE, json_response, error_response,
+    parse_body
+)
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """Custom JSON encoder for Decimal objects"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
+# Matches the raw path of the one parameterized route, for events that carry
+# no API Gateway resource template (e.g. local invocations)
+_TARGET_ITEM_RE = re.compile(r'^/rebalance/targets/(?P<allocation_id>[^/]+)/?$')
+_ITEM_RESOURCE = '/rebalance/targets/{allocation_id}'
+
+
+def _resource(event: Dict[str, Any]) -> str:
+    """Route key for the request: the resource template, else the raw path"""
+    resource = event.get('resource')
+    if resource:
+        return resource
+
+    path = event.get('path', '')
+    match = _TARGET_ITEM_RE.match(path)
+    if match:
+        event['pathParameters'] = match.groupdict()
+        return _ITEM_RESOURCE
+    return path
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Main handler for rebalancing endpoints"""
-    logger.info(f"Rebalance handler received event: {json.dumps(event)}")
-
     http_method = event.get('httpMethod', '')
-    path = event.get('path', '')
 
-    # Handle OPTIONS for CORS preflight - must come before auth check
+    # Handle OPTIONS for CORS preflight - must come before logging and the auth check
     if http_method == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token',
-                'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-            },
-            'body': ''
-        }
+        return PREFLIGHT_RESPONSE
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Rebalance handler received event: %s", json.dumps(event, default=str))
 
     # Get user ID from authorizer
     user_id = event.get('requestContext', {}).get('authorizer', {}).get('user_id')
 
     if not user_id:
-        return {
-            'statusCode': 401,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Unauthorized'})
-        }
+        return UNAUTHORIZED_RESPONSE
 
     try:
-        if http_method == 'GET':
-            if '/rebalance/targets' in path:
-                return get_targets(event, user_id)
-            elif '/rebalance/calculate' in path:
-                return calculate_rebalance(event, user_id)
-            elif '/rebalance/drift' in path:
-                return get_drift(event, user_id)
-        elif http_method == 'POST':
-            if '/rebalance/targets' in path:
-                return set_target(event, user_id)
-        elif http_method == 'DELETE':
-            if '/rebalance/targets/' in path:
-                return delete_target(event, user_id)
-
-        return {
-            'statusCode': 404,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Not found'})
-        }
+        route = _ROUTES.get((http_method, _resource(event)))
+
+        if route:
+            return route(event, user_id)
+
+        return NOT_FOUND_RESPONSE
 
     except Exception as e:
         logger.error(f"Error in rebalance handler: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        return error_response(500, str(e))
 
 
 def get_targets(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get all target allocations"""
     targets = rebalance_service.get_target_allocations(user_id)
 
-    # Calculate total
-    total_percentage = sum(t['target_percentage'] for t in targets)
-
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': {
-                'targets': targets,
-                'total_percentage': total_percentage,
-                'is_valid': abs(total_percentage - 100) < 0.01
-            }
-        }, cls=DecimalEncoder)
-    }
+    # Calculate total; the service already returns floats, fsum avoids drift
+    total_percentage = math.fsum(t['target_percentage'] for t in targets)
+
+    return json_response(200, {
+        'success': True,
+        'data': {
+            'targets': targets,
+            'total_percentage': total_percentage,
+            'is_valid': abs(total_percentage - 100.0) < 0.01
+        }
+    })
 
 
 def set_target(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Set or update a target allocation"""
-    body = json.loads(event.get('body', '{}'))
+    body = parse_body(event)
 
     asset_type = body.get('asset_type')
     target_percentage = body.get('target_percentage')
@@ -122,24 +94,10 @@ def set_target(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     category = body.get('category')
 
     if not asset_type or target_percentage is None:
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'asset_type and target_percentage are required'})
-        }
+        return error_response(400, 'asset_type and target_percentage are required')
 
     if target_percentage < 0 or target_percentage > 100:
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'target_percentage must be between 0 and 100'})
-        }
+        return error_response(400, 'target_percentage must be between 0 and 100')
 
     result = rebalance_service.set_target_allocation(
         user_id,
@@ -149,17 +107,7 @@ def set_target(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         category
     )
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {'success': True, 'data': result})
 
 
 def delete_target(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
@@ -169,27 +117,11 @@ def delete_target(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     allocation_id = path_params.get('allocation_id')
 
     if not allocation_id:
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'allocation_id is required'})
-        }
+        return error_response(400, 'allocation_id is required')
 
     success = rebalance_service.delete_target_allocation(user_id, allocation_id)
 
-    return {
-        'statusCode': 200 if success else 500,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': success
-        })
-    }
+    return json_response(200 if success else 500, {'success': success})
 
 
 def calculate_rebalance(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
@@ -199,31 +131,20 @@ def calculate_rebalance(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
 
     result = rebalance_service.calculate_rebalance(user_id, additional_investment)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {'success': True, 'data': result})
 
 
 def get_drift(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get portfolio drift from targets"""
     result = rebalance_service.get_portfolio_drift(user_id)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {'success': True, 'data': result})
+
+
+_ROUTES = {
+    ('GET', '/rebalance/targets'): get_targets,
+    ('POST', '/rebalance/targets'): set_target,
+    ('DELETE', _ITEM_RESOURCE): delete_target,
+    ('GET', '/rebalance/calculate'): calculate_rebalance,
+    ('GET', '/rebalance/drift'): get_drift,
+}
@@ -3,205 +3,191 @@ Portfolio Scenarios & Projections API Handler
 """
 import json
 import logging
+import re
 from typing import Dict, Any
-from decimal import Decimal
 
 from services.scenarios_service import scenarios_service
+from handlers._common import (
+    PREFLIGHT_RESPONSE, UNAUTHORIZED_RESPONSE, NOT_FOUND_RESPONSE, json_response, error_response,
+    parse_body
+)
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """Custom JSON encoder for Decimal objects"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
+# Matches the raw path of the one parameterized route, for events that carry
+# no API Gateway resource template (e.g. local invocations)
+_GOAL_ITEM_RE = re.compile(r'^/scenarios/goals/(?P<goal_id>[^/]+)/?$')
+_ITEM_RESOURCE = '/scenarios/goals/{goal_id}'
+
+
+def _resource(event: Dict[str, Any]) -> str:
+    """Route key for the request: the resource template, else the raw path"""
+    resource = event.get('resource')
+    if resource:
+        return resource
+
+    path = event.get('path', '')
+    match = _GOAL_ITEM_RE.match(path)
+    if match:
+        event['pathParameters'] = match.groupdict()
+        return _ITEM_RESOURCE
+    return path
+
+
+# Upper bound on Monte Carlo paths per request; larger asks are clamped
+MAX_SIMULATIONS = 10_000
+
+# Longest horizon a projection may cover; the per-month loops and Monte Carlo
+# path arrays grow linearly with it
+MAX_YEARS = 100
+
+# Query parameter specs: (name, type, default, minimum, maximum)
+_PROJECTION_SPEC = (
+    ('years', int, 10, 1, MAX_YEARS),
+    ('monthly_contribution', float, 0.0, None, None),
+    ('expected_return', float, None, None, None),
+    ('inflation_rate', float, 3.0, None, None),
+)
+_MONTE_CARLO_SPEC = (
+    ('years', int, 10, 1, MAX_YEARS),
+    ('simulations', int, 1000, 1, None),
+    ('monthly_contribution', float, 0.0, None, None),
+)
+_RETIREMENT_SPEC = (
+    ('retirement_age', int, 65, 0, MAX_YEARS),
+    ('current_age', int, 30, 0, MAX_YEARS),
+    ('monthly_contribution', float, 500.0, None, None),
+    ('monthly_expense', float, 5000.0, None, None),
+    ('social_security', float, 2000.0, None, None),
+)
+
+
+def _coerce(params: Dict[str, Any], spec: tuple) -> Dict[str, Any]:
+    """Convert query parameters per spec; raises ValueError naming the bad one"""
+    values = {}
+    for name, cast, default, minimum, maximum in spec:
+        raw = params.get(name)
+        if raw is None or raw == '':
+            values[name] = default
+            continue
+        try:
+            value = cast(raw)
+        except ValueError:
+            raise ValueError(f"{name} must be {'an integer' if cast is int else 'a number'}") from None
+        if minimum is not None and value < minimum:
+            raise ValueError(f"{name} must be at least {minimum}")
+        if maximum is not None and value > maximum:
+            raise ValueError(f"{name} must be at most {maximum}")
+        values[name] = value
+    return values
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Main handler for scenarios endpoints"""
-    logger.info(f"Scenarios handler received event: {json.dumps(event)}")
-
     http_method = event.get('httpMethod', '')
-    path = event.get('path', '')
 
-    # Handle OPTIONS for CORS preflight - must come before auth check
+    # Handle OPTIONS for CORS preflight - must come before logging and the auth check
     if http_method == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token',
-                'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-            },
-            'body': ''
-        }
+        return PREFLIGHT_RESPONSE
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Scenarios handler received event: %s", json.dumps(event, default=str))
 
     # Get user ID from authorizer
     user_id = event.get('requestContext', {}).get('authorizer', {}).get('user_id')
 
     if not user_id:
-        return {
-            'statusCode': 401,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Unauthorized'})
-        }
+        return UNAUTHORIZED_RESPONSE
 
     try:
-        if http_method == 'GET':
-            if '/scenarios/projection' in path:
-                return get_projection(event, user_id)
-            elif '/scenarios/monte-carlo' in path:
-                return get_monte_carlo(event, user_id)
-            elif '/scenarios/retirement' in path:
-                return get_retirement(event, user_id)
-            elif '/scenarios/goals' in path:
-                return get_goals(event, user_id)
-        elif http_method == 'POST':
-            if '/scenarios/goals' in path:
-                return create_goal(event, user_id)
-        elif http_method == 'DELETE':
-            if '/scenarios/goals/' in path:
-                return delete_goal(event, user_id)
-
-        return {
-            'statusCode': 404,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Not found'})
-        }
+        route = _ROUTES.get((http_method, _resource(event)))
+
+        if route:
+            return route(event, user_id)
+
+        return NOT_FOUND_RESPONSE
 
     except Exception as e:
         logger.error(f"Error in scenarios handler: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        return error_response(500, str(e))
 
 
 def get_projection(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get future value projection"""
     params = event.get('queryStringParameters', {}) or {}
 
-    years = int(params.get('years', 10))
-    monthly_contribution = float(params.get('monthly_contribution', 0))
-    expected_return = params.get('expected_return')
-    if expected_return:
-        expected_return = float(expected_return) / 100  # Convert percentage to decimal
-    inflation_rate = float(params.get('inflation_rate', 3)) / 100
+    try:
+        args = _coerce(params, _PROJECTION_SPEC)
+    except ValueError as e:
+        return error_response(400, str(e))
+
+    expected_return = args['expected_return']
+    if expected_return is not None:
+        expected_return /= 100  # Convert percentage to decimal
 
     result = scenarios_service.calculate_future_value(
         user_id,
-        years=years,
-        monthly_contribution=monthly_contribution,
+        years=args['years'],
+        monthly_contribution=args['monthly_contribution'],
         expected_return=expected_return,
-        inflation_rate=inflation_rate
+        inflation_rate=args['inflation_rate'] / 100
     )
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {'success': True, 'data': result})
 
 
 def get_monte_carlo(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Run Monte Carlo simulation"""
     params = event.get('queryStringParameters', {}) or {}
 
-    years = int(params.get('years', 10))
-    simulations = int(params.get('simulations', 1000))
-    monthly_contribution = float(params.get('monthly_contribution', 0))
+    try:
+        args = _coerce(params, _MONTE_CARLO_SPEC)
+    except ValueError as e:
+        return error_response(400, str(e))
 
     result = scenarios_service.run_monte_carlo(
         user_id,
-        years=years,
-        simulations=simulations,
-        monthly_contribution=monthly_contribution
+        years=args['years'],
+        simulations=min(args['simulations'], MAX_SIMULATIONS),
+        monthly_contribution=args['monthly_contribution']
     )
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {'success': True, 'data': result})
 
 
 def get_retirement(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get retirement projection"""
     params = event.get('queryStringParameters', {}) or {}
 
-    retirement_age = int(params.get('retirement_age', 65))
-    current_age = int(params.get('current_age', 30))
-    monthly_contribution = float(params.get('monthly_contribution', 500))
-    monthly_expense = float(params.get('monthly_expense', 5000))
-    social_security = float(params.get('social_security', 2000))
+    try:
+        args = _coerce(params, _RETIREMENT_SPEC)
+    except ValueError as e:
+        return error_response(400, str(e))
 
     result = scenarios_service.get_retirement_projection(
         user_id,
-        retirement_age=retirement_age,
-        current_age=current_age,
-        monthly_contribution=monthly_contribution,
-        monthly_expense_retirement=monthly_expense,
-        social_security=social_security
+        retirement_age=args['retirement_age'],
+        current_age=args['current_age'],
+        monthly_contribution=args['monthly_contribution'],
+        monthly_expense_retirement=args['monthly_expense'],
+        social_security=args['social_security']
     )
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {'success': True, 'data': result})
 
 
 def get_goals(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get all goals"""
     result = scenarios_service.get_goals(user_id)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {'success': True, 'data': result})
 
 
 def create_goal(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Create a new goal"""
-    body = json.loads(event.get('body', '{}'))
+    body = parse_body(event)
 
     goal_name = body.get('goal_name')
     target_amount = float(body.get('target_amount', 0))
@@ -210,14 +196,7 @@ def create_goal(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     notes = body.get('notes')
 
     if not goal_name or not target_amount or not target_date:
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'goal_name, target_amount, and target_date are required'})
-        }
+        return error_response(400, 'goal_name, target_amount, and target_date are required')
 
     result = scenarios_service.create_goal(
         user_id,
@@ -228,17 +207,7 @@ def create_goal(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         notes=notes
     )
 
-    return {
-        'statusCode': 201,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(201, {'success': True, 'data': result})
 
 
 def delete_goal(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
@@ -247,25 +216,18 @@ def delete_goal(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     goal_id = path_params.get('goal_id')
 
     if not goal_id:
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'goal_id is required'})
-        }
+        return error_response(400, 'goal_id is required')
 
     result = scenarios_service.delete_goal(user_id, goal_id)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': result
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {'success': True, 'data': result})
+
+
+_ROUTES = {
+    ('GET', '/scenarios/projection'): get_projection,
+    ('GET', '/scenarios/monte-carlo'): get_monte_carlo,
+    ('GET', '/scenarios/retirement'): get_retirement,
+    ('GET', '/scenarios/goals'): get_goals,
+    ('POST', '/scenarios/goals'): create_goal,
+    ('DELETE', _ITEM_RESOURCE): delete_goal,
+}
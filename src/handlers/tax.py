@@ -3,165 +3,128 @@ Tax Report API Handler
 """
 import json
 import logging
+import time
 from typing import Dict, Any
-from datetime import datetime
-from decimal import Decimal
+from datetime import datetime, timezone
 
 from services.tax_service import tax_service
+from handlers._common import (
+    PREFLIGHT_RESPONSE, UNAUTHORIZED_RESPONSE, NOT_FOUND_RESPONSE, json_response
+)
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-
-class DecimalEncoder(json.JSONEncoder):
-    """Custom JSON encoder for Decimal objects"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
+# Runs during container init, so the first request finds a live connection
+tax_service.warm()
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Main handler for tax report endpoints"""
-    logger.info(f"Tax handler received event: {json.dumps(event)}")
-
     http_method = event.get('httpMethod', '')
-    path = event.get('path', '')
 
-    # Handle OPTIONS for CORS preflight - must come before auth check
+    # Handle OPTIONS for CORS preflight - must come before logging and the auth check
     if http_method == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token',
-                'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-            },
-            'body': ''
-        }
+        return PREFLIGHT_RESPONSE
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Tax handler received event: %s", json.dumps(event, default=str))
 
     # Get user ID from authorizer
     user_id = event.get('requestContext', {}).get('authorizer', {}).get('user_id')
 
     if not user_id:
-        return {
-            'statusCode': 401,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Unauthorized'})
-        }
+        return UNAUTHORIZED_RESPONSE
 
     try:
-        if http_method == 'GET':
-            if '/tax/summary' in path:
-                return get_tax_summary(event, user_id)
-            elif '/tax/form-8949' in path:
-                return get_form_8949(event, user_id)
-            elif '/tax/unrealized' in path:
-                return get_unrealized_gains(event, user_id)
-            elif '/tax/harvesting' in path:
-                return get_tax_loss_harvesting(event, user_id)
-
-        return {
-            'statusCode': 404,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': 'Not found'})
-        }
+        # API Gateway's resource template; fall back to the raw path
+        resource = event.get('resource') or event.get('path', '')
+        route = _ROUTES.get((http_method, resource))
+
+        if route:
+            return route(event, user_id)
+
+        return NOT_FOUND_RESPONSE
 
     except Exception as e:
         logger.error(f"Error in tax handler: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        return json_response(500, {'error': str(e)})
+
+
+# (year, epoch seconds at which it ends); refreshed by _current_year
+_year_cache = [0, 0.0]
+
+
+def _current_year() -> int:
+    """Current UTC year, recomputed only once the cached year has ended"""
+    if time.time() >= _year_cache[1]:
+        year = datetime.now(timezone.utc).year
+        _year_cache[0] = year
+        _year_cache[1] = datetime(year + 1, 1, 1, tzinfo=timezone.utc).timestamp()
+    return _year_cache[0]
+
+
+def _tax_year(params: Dict[str, Any]) -> int:
+    """The 'year' query parameter, defaulting to the current year"""
+    year = params.get('year')
+    return int(year) if year else _current_year()
 
 
 def get_tax_summary(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get tax year summary"""
     params = event.get('queryStringParameters', {}) or {}
-    tax_year = int(params.get('year', datetime.utcnow().year))
+    tax_year = _tax_year(params)
 
     summary = tax_service.get_tax_year_summary(user_id, tax_year)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': summary
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {
+        'success': True,
+        'data': summary
+    })
 
 
 def get_form_8949(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get Form 8949 data"""
     params = event.get('queryStringParameters', {}) or {}
-    tax_year = int(params.get('year', datetime.utcnow().year))
+    tax_year = _tax_year(params)
 
     form_data = tax_service.generate_form_8949(user_id, tax_year)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': {
-                'tax_year': tax_year,
-                'entries': form_data
-            }
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {
+        'success': True,
+        'data': {
+            'tax_year': tax_year,
+            'entries': form_data
+        }
+    })
 
 
 def get_unrealized_gains(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get unrealized gains/losses"""
     unrealized = tax_service.get_unrealized_gains(user_id)
 
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': unrealized
-        }, cls=DecimalEncoder)
-    }
+    return json_response(200, {
+        'success': True,
+        'data': unrealized
+    })
 
 
 def get_tax_loss_harvesting(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get tax loss harvesting opportunities"""
-    opportunities = tax_service.get_tax_loss_harvesting_opportunities(user_id)
-
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-        },
-        'body': json.dumps({
-            'success': True,
-            'data': {
-                'opportunities': opportunities,
-                'total_potential_loss': sum(o['unrealized_loss'] for o in opportunities)
-            }
-        }, cls=DecimalEncoder)
-    }
+    opportunities, total_loss = tax_service.get_tax_loss_harvesting_opportunities(user_id)
+
+    return json_response(200, {
+        'success': True,
+        'data': {
+            'opportunities': opportunities,
+            'total_potential_loss': total_loss
+        }
+    })
+
+
+_ROUTES = {
+    ('GET', '/tax/summary'): get_tax_summary,
+    ('GET', '/tax/form-8949'): get_form_8949,
+    ('GET', '/tax/unrealized'): get_unrealized_gains,
+    ('GET', '/tax/harvesting'): get_tax_loss_harvesting,
+}
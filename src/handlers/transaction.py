@@ -1,433 +1,226 @@
-import json
 import logging
-from typing import Dict, Any
+import re
+from typing import Dict, Any, List
 from datetime import datetime
-from decimal import Decimal
-from models.transaction import TransactionCreate, TransactionUpdate, CostBasisMethod
+from pydantic import TypeAdapter
+from models.transaction import Transaction, TransactionCreate, TransactionUpdate, CostBasisMethod
 from services.transaction_service import TransactionService
 from models.response import SuccessResponse, ErrorResponse
+from handlers._common import (
+    JSON_HEADERS, PREFLIGHT_RESPONSE, UNAUTHORIZED_RESPONSE, NOT_FOUND_RESPONSE, json_response, model_response,
+    error_response, clamp_int, parse_body
+)
 
 logger = logging.getLogger(__name__)
 
+# Fixed error responses, built once at import
+_TRANSACTION_NOT_FOUND = error_response(404, 'Transaction not found')
+_ASSET_ID_REQUIRED = error_response(400, 'asset_id is required')
 
-class DateTimeEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles datetime and Decimal objects"""
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
+# ?method= value -> CostBasisMethod, so lookups skip the enum constructor
+_COST_BASIS_METHODS = {m.value: m for m in CostBasisMethod}
 
+# Serializes a whole transaction list to JSON in one pass, no per-item dicts
+_TRANSACTION_LIST = TypeAdapter(List[Transaction])
 
+# Raw-path fallback for the item routes when the event carries no resource
+# template; the static /history and /cost-basis routes are excluded up front
+_TRANSACTION_ITEM_RE = re.compile(
+    r'^/transactions/(?!(?:history|cost-basis)/?$)(?P<transaction_id>[^/]+)/?$'
+)
+_ITEM_RESOURCE = '/transactions/{transaction_id}'
+_TX_SEP = '/transactions/'
+
+
+def _resource(event: Dict[str, Any]) -> str:
+    """Route key for the request: the resource template, else the raw path"""
+    resource = event.get('resource')
+    if resource:
+        return resource
+
+    path = event.get('path', '')
+    match = _TRANSACTION_ITEM_RE.match(path)
+    if match:
+        event['pathParameters'] = match.groupdict()
+        return _ITEM_RESOURCE
+    return path
+
+
+def _transaction_id(event: Dict[str, Any]) -> str:
+    """transaction_id from the path parameters, else the tail of the raw path"""
+    transaction_id = (event.get('pathParameters') or {}).get('transaction_id')
+    if transaction_id:
+        return transaction_id
+    return event.get('path', '').rpartition(_TX_SEP)[2]
+
+
+# Built and warmed during container init rather than on the first request
 transaction_service = TransactionService()
+transaction_service.warm()
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Main handler for transaction endpoints"""
     try:
-        path = event.get('path', '')
         http_method = event.get('httpMethod', '')
 
         # Handle CORS preflight
         if http_method == 'OPTIONS':
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-                    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token',
-                    'Access-Control-Max-Age': '600',
-                },
-                'body': ''
-            }
+            return PREFLIGHT_RESPONSE
 
         # Get user_id from authorizer context
         user_id = event.get('requestContext', {}).get('authorizer', {}).get('user_id')
 
         if not user_id:
-            return {
-                'statusCode': 401,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Unauthorized'})
-            }
-
-        # Route to appropriate handler
-        if path.endswith('/transactions') and http_method == 'GET':
-            return list_transactions(event, user_id)
-        elif path.endswith('/transactions') and http_method == 'POST':
-            return create_transaction(event, user_id)
-        elif path.endswith('/transactions/history') and http_method == 'GET':
-            return get_transaction_history(event, user_id)
-        elif '/transactions/' in path and http_method == 'GET':
-            return get_transaction(event, user_id)
-        elif '/transactions/' in path and http_method == 'PUT':
-            return update_transaction(event, user_id)
-        elif '/transactions/' in path and http_method == 'DELETE':
-            return delete_transaction(event, user_id)
-        elif path.endswith('/cost-basis') and http_method == 'GET':
-            return get_cost_basis(event, user_id)
-        else:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Not found'})
-            }
+            return UNAUTHORIZED_RESPONSE
+
+        route = _ROUTES.get((http_method, _resource(event)))
+
+        if not route:
+            return NOT_FOUND_RESPONSE
 
+        return route(event, user_id)
+
+    except ValueError as e:
+        # Covers pydantic validation errors, bad dates and unknown enum values
+        logger.error(f"Validation error in transaction handler: {str(e)}")
+        return error_response(400, str(e))
     except Exception as e:
         logger.error(f"Error in transaction handler: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        return error_response(500, str(e))
 
 
 def create_transaction(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Create a new transaction"""
-    try:
-        body = json.loads(event.get('body', '{}'))
-
-        # Parse transaction_date
-        if 'transaction_date' in body:
-            body['transaction_date'] = datetime.fromisoformat(body['transaction_date'].replace('Z', '+00:00'))
-
-        transaction_data = TransactionCreate(**body)
-        transaction = transaction_service.create_transaction(user_id, transaction_data)
-
-        return {
-            'statusCode': 201,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({
-                'success': True,
-                'data': transaction.dict()
-            }, cls=DateTimeEncoder)
-        }
+    body = parse_body(event)
 
-    except ValueError as e:
-        logger.error(f"Validation error creating transaction: {str(e)}")
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
-    except Exception as e:
-        logger.error(f"Error creating transaction: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+    transaction_data = TransactionCreate.model_validate(body)
+    transaction = transaction_service.create_transaction(user_id, transaction_data)
+
+    return model_response(201, transaction)
 
 
 def get_transaction(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get a specific transaction"""
-    try:
-        # Extract transaction_id from path
-        path = event.get('path', '')
-        transaction_id = path.split('/transactions/')[-1]
-
-        transaction = transaction_service.get_transaction(user_id, transaction_id)
-
-        if not transaction:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Transaction not found'})
-            }
-
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({
-                'success': True,
-                'data': transaction.dict()
-            }, cls=DateTimeEncoder)
-        }
+    transaction_id = _transaction_id(event)
 
-    except Exception as e:
-        logger.error(f"Error getting transaction: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+    transaction = transaction_service.get_transaction(user_id, transaction_id)
+
+    if not transaction:
+        return _TRANSACTION_NOT_FOUND
+
+    return model_response(200, transaction)
 
 
 def list_transactions(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """List transactions with optional filters"""
-    try:
-        query_params = event.get('queryStringParameters') or {}
-
-        # Parse filters
-        asset_id = query_params.get('asset_id')
-        asset_type = query_params.get('asset_type')
-        transaction_type = query_params.get('transaction_type')
-        limit = int(query_params.get('limit', 100))
-
-        # Parse date filters
-        start_date = None
-        end_date = None
-        if 'start_date' in query_params:
-            start_date = datetime.fromisoformat(query_params['start_date'].replace('Z', '+00:00'))
-        if 'end_date' in query_params:
-            end_date = datetime.fromisoformat(query_params['end_date'].replace('Z', '+00:00'))
-
-        transactions = transaction_service.get_transactions(
-            user_id,
-            asset_id=asset_id,
-            asset_type=asset_type,
-            transaction_type=transaction_type,
-            start_date=start_date,
-            end_date=end_date,
-            limit=limit
+    query_params = event.get('queryStringParameters') or {}
+
+    # Parse filters
+    asset_id = query_params.get('asset_id')
+    asset_type = query_params.get('asset_type')
+    transaction_type = query_params.get('transaction_type')
+    limit = clamp_int(query_params.get('limit'), 100)
+
+    # Parse date filters; fromisoformat accepts a trailing 'Z' on 3.11+
+    start_date = None
+    end_date = None
+    if 'start_date' in query_params:
+        start_date = datetime.fromisoformat(query_params['start_date'])
+    if 'end_date' in query_params:
+        end_date = datetime.fromisoformat(query_params['end_date'])
+
+    transactions = transaction_service.get_transactions(
+        user_id,
+        asset_id=asset_id,
+        asset_type=asset_type,
+        transaction_type=transaction_type,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit
+    )
+
+    # Body is assembled around the pre-encoded list rather than re-dumped
+    return {
+        'statusCode': 200,
+        'headers': JSON_HEADERS,
+        'body': '{"success":true,"data":{"transactions":%s,"count":%d}}' % (
+            _TRANSACTION_LIST.dump_json(transactions).decode(),
+            len(transactions)
         )
-
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({
-                'success': True,
-                'data': {
-                    'transactions': [t.dict() for t in transactions],
-                    'count': len(transactions)
-                }
-            }, cls=DateTimeEncoder)
-        }
-
-    except Exception as e:
-        logger.error(f"Error listing transactions: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+    }
 
 
 def update_transaction(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Update a transaction"""
-    try:
-        # Extract transaction_id from path
-        path = event.get('path', '')
-        transaction_id = path.split('/transactions/')[-1]
-
-        body = json.loads(event.get('body', '{}'))
-
-        # Parse transaction_date if present
-        if 'transaction_date' in body:
-            body['transaction_date'] = datetime.fromisoformat(body['transaction_date'].replace('Z', '+00:00'))
-
-        update_data = TransactionUpdate(**body)
-        transaction = transaction_service.update_transaction(user_id, transaction_id, update_data)
-
-        if not transaction:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Transaction not found'})
-            }
-
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({
-                'success': True,
-                'data': transaction.dict()
-            }, cls=DateTimeEncoder)
-        }
+    transaction_id = _transaction_id(event)
 
-    except ValueError as e:
-        logger.error(f"Validation error updating transaction: {str(e)}")
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
-    except Exception as e:
-        logger.error(f"Error updating transaction: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+    body = parse_body(event)
+
+    update_data = TransactionUpdate.model_validate(body)
+    transaction = transaction_service.update_transaction(user_id, transaction_id, update_data)
+
+    if not transaction:
+        return _TRANSACTION_NOT_FOUND
+
+    return model_response(200, transaction)
 
 
 def delete_transaction(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Delete a transaction"""
-    try:
-        # Extract transaction_id from path
-        path = event.get('path', '')
-        transaction_id = path.split('/transactions/')[-1]
-
-        success = transaction_service.delete_transaction(user_id, transaction_id)
-
-        if not success:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Transaction not found'})
-            }
-
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({
-                'success': True,
-                'message': 'Transaction deleted successfully'
-            })
-        }
+    transaction_id = _transaction_id(event)
 
-    except Exception as e:
-        logger.error(f"Error deleting transaction: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+    success = transaction_service.delete_transaction(user_id, transaction_id)
+
+    if not success:
+        return _TRANSACTION_NOT_FOUND
+
+    return json_response(200, {
+        'success': True,
+        'message': 'Transaction deleted successfully'
+    })
 
 
 def get_transaction_history(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get transaction history with aggregated statistics"""
-    try:
-        query_params = event.get('queryStringParameters') or {}
+    query_params = event.get('queryStringParameters') or {}
 
-        asset_id = query_params.get('asset_id')
-        asset_type = query_params.get('asset_type')
+    asset_id = query_params.get('asset_id')
+    asset_type = query_params.get('asset_type')
 
-        history = transaction_service.get_transaction_history(
-            user_id,
-            asset_id=asset_id,
-            asset_type=asset_type
-        )
-
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({
-                'success': True,
-                'data': history.dict()
-            }, cls=DateTimeEncoder)
-        }
+    history = transaction_service.get_transaction_history(
+        user_id,
+        asset_id=asset_id,
+        asset_type=asset_type
+    )
 
-    except Exception as e:
-        logger.error(f"Error getting transaction history: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+    return model_response(200, history)
 
 
 def get_cost_basis(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """Get cost basis calculation for an asset"""
-    try:
-        query_params = event.get('queryStringParameters') or {}
-
-        asset_id = query_params.get('asset_id')
-        if not asset_id:
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'asset_id is required'})
-            }
-
-        method_str = query_params.get('method', 'fifo').lower()
-        method = CostBasisMethod(method_str)
-
-        cost_basis = transaction_service.calculate_cost_basis(user_id, asset_id, method)
-
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({
-                'success': True,
-                'data': cost_basis.dict()
-            }, cls=DateTimeEncoder)
-        }
+    query_params = event.get('queryStringParameters') or {}
 
-    except ValueError as e:
-        logger.error(f"Validation error getting cost basis: {str(e)}")
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
-    except Exception as e:
-        logger.error(f"Error getting cost basis: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+    asset_id = query_params.get('asset_id')
+    if not asset_id:
+        return _ASSET_ID_REQUIRED
+
+    method_str = (query_params.get('method') or 'fifo').lower()
+    method = _COST_BASIS_METHODS.get(method_str)
+    if method is None:
+        return error_response(400, f"Invalid cost basis method: {method_str}")
+
+    cost_basis = transaction_service.calculate_cost_basis(user_id, asset_id, method)
+
+    return model_response(200, cost_basis)
+
+
+_ROUTES = {
+    ('GET', '/transactions'): list_transactions,
+    ('POST', '/transactions'): create_transaction,
+    ('GET', '/transactions/history'): get_transaction_history,
+    ('GET', '/transactions/cost-basis'): get_cost_basis,
+    ('GET', _ITEM_RESOURCE): get_transaction,
+    ('PUT', _ITEM_RESOURCE): update_transaction,
+    ('DELETE', _ITEM_RESOURCE): delete_transaction,
+}
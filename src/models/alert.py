@@ -4,7 +4,8 @@ Supports various alert types: price, percentage change, portfolio value, etc.
 """
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from .base import DeferredModel
 from enum import Enum
 
 
@@ -57,7 +58,16 @@ class AlertNotificationChannel(str, Enum):
     IN_APP = 'in_app'
 
 
-class Alert(BaseModel):
+# Shared by every alert model that carries a channel list
+NotificationChannelList = List[AlertNotificationChannel]
+
+
+def _default_channels() -> list:
+    """Fresh default per instance, instead of deep-copying a shared list"""
+    return ['in_app']
+
+
+class Alert(DeferredModel):
     """Main alert model"""
     alert_id: str
     user_id: str
@@ -66,7 +76,7 @@ class Alert(BaseModel):
     condition: AlertCondition
     priority: AlertPriority = AlertPriority.MEDIUM
     status: AlertStatus = AlertStatus.ACTIVE
-    notification_channels: List[AlertNotificationChannel] = ['in_app']
+    notification_channels: NotificationChannelList = Field(default_factory=_default_channels)
 
     # Trigger settings
     trigger_once: bool = False  # True = trigger only once, False = repeatable
@@ -80,10 +90,10 @@ class Alert(BaseModel):
     expires_at: Optional[datetime] = None
 
     # Metadata
-    metadata: Optional[dict] = {}
+    metadata: Optional[dict] = Field(default_factory=dict)
 
 
-class AlertHistory(BaseModel):
+class AlertHistory(DeferredModel):
     """Record of an alert being triggered"""
     history_id: str
     alert_id: str
@@ -91,7 +101,7 @@ class AlertHistory(BaseModel):
     triggered_at: datetime
     condition_met: dict  # Snapshot of what triggered the alert
     notification_sent: bool
-    notification_channels: List[AlertNotificationChannel]
+    notification_channels: NotificationChannelList
     asset_price: Optional[float] = None
     portfolio_value: Optional[float] = None
 
@@ -102,7 +112,7 @@ class CreateAlertRequest(BaseModel):
     description: Optional[str] = None
     condition: AlertCondition
     priority: AlertPriority = AlertPriority.MEDIUM
-    notification_channels: List[AlertNotificationChannel] = ['in_app']
+    notification_channels: NotificationChannelList = Field(default_factory=_default_channels)
     trigger_once: bool = False
     cooldown_minutes: int = 60
     expires_at: Optional[datetime] = None
@@ -115,7 +125,7 @@ class UpdateAlertRequest(BaseModel):
     condition: Optional[AlertCondition] = None
     priority: Optional[AlertPriority] = None
     status: Optional[AlertStatus] = None
-    notification_channels: Optional[List[AlertNotificationChannel]] = None
+    notification_channels: Optional[NotificationChannelList] = None
     trigger_once: Optional[bool] = None
     cooldown_minutes: Optional[int] = None
     expires_at: Optional[datetime] = None
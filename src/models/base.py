@@ -0,0 +1,13 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class DeferredModel(BaseModel):
+    """
+    Base for models that not every function uses
+
+    defer_build skips building the pydantic-core validator and serializer at
+    class definition; pydantic builds them on first validation instead. Every
+    import of a models submodule also runs models/__init__, so without this each
+    Lambda pays for the schemas of models it never touches
+    """
+    model_config = ConfigDict(defer_build=True)
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from .base import DeferredModel
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from enum import Enum
@@ -53,16 +54,12 @@ class NotificationPreferences(BaseModel):
     timezone: str = "UTC"
 
     # Rate limiting
-    max_emails_per_day: int = 10
-    emails_sent_today: int = 0
-    last_email_date: Optional[str] = None
+    max_emails_per_day: int = 10  # Sent count lives in a per-day EMAIL_COUNT# item
 
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-        use_enum_values = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
 
 class NotificationPreferencesUpdate(BaseModel):
@@ -80,7 +77,7 @@ class NotificationPreferencesUpdate(BaseModel):
     timezone: Optional[str] = None
 
 
-class Notification(BaseModel):
+class Notification(DeferredModel):
     notification_id: str
     user_id: str
     notification_type: NotificationType
@@ -101,9 +98,7 @@ class Notification(BaseModel):
 
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-        use_enum_values = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
 
 class NotificationCreate(BaseModel):
@@ -124,6 +119,13 @@ class NotificationHistoryQuery(BaseModel):
     offset: int = 0
 
 
+class NotificationHistoryResponse(BaseModel):
+    notifications: List[Notification]
+    count: int
+    limit: int
+    offset: int
+
+
 class TestEmailRequest(BaseModel):
     notification_type: NotificationType = NotificationType.DAILY_DIGEST
 
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Union
+from pydantic import BaseModel, Field, field_validator
+from .base import DeferredModel
+from typing import Any, Optional, List
 from datetime import datetime, date
 from enum import Enum
 
@@ -9,7 +10,7 @@ class AssetType(str, Enum):
     STOCK = "stock"
 
 
-class PurchaseEntry(BaseModel):
+class PurchaseEntry(DeferredModel):
     """Individual purchase entry within an asset"""
     purchase_id: str
     quantity: float
@@ -18,7 +19,7 @@ class PurchaseEntry(BaseModel):
     total_cost: float
 
 
-class Asset(BaseModel):
+class Asset(DeferredModel):
     asset_id: Optional[str] = None
     user_id: str
     asset_type: AssetType
@@ -36,21 +37,48 @@ class Asset(BaseModel):
     updated_at: Optional[datetime] = None
 
 
+def _to_datetime(value: Any) -> Any:
+    """
+    Coerce a purchase_date input to datetime in a single pass
+
+    ISO datetime and YYYY-MM-DD strings both parse with fromisoformat; an
+    unparseable string falls back to now, as the portfolio service always did
+    """
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return datetime.utcnow()
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, datetime.min.time())
+    return value
+
+
 class AssetCreate(BaseModel):
     asset_type: AssetType
     symbol: str
     quantity: float = Field(..., gt=0)
     purchase_price: float = Field(..., gt=0)
-    purchase_date: Union[date, datetime, str]
+    purchase_date: datetime
+
+    @field_validator('purchase_date', mode='before')
+    @classmethod
+    def parse_purchase_date(cls, value: Any) -> Any:
+        return _to_datetime(value)
 
 
 class AssetUpdate(BaseModel):
     quantity: Optional[float] = Field(None, gt=0)
     purchase_price: Optional[float] = Field(None, gt=0)
-    purchase_date: Optional[Union[date, datetime, str]] = None
+    purchase_date: Optional[datetime] = None
+
+    @field_validator('purchase_date', mode='before')
+    @classmethod
+    def parse_purchase_date(cls, value: Any) -> Any:
+        return _to_datetime(value)
 
 
-class Portfolio(BaseModel):
+class Portfolio(DeferredModel):
     user_id: str
     assets: List[Asset]
     total_value: float
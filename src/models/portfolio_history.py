@@ -1,13 +1,21 @@
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List
+from typing import Literal, Optional, List
 from pydantic import BaseModel, Field
+from .base import DeferredModel
 
+# Closed value sets: pydantic checks membership in one lookup and rejects
+# anything else, instead of passing free-form strings through to the service
+PortfolioType = Literal['crypto', 'stock', 'combined']
+Period = Literal['24H', '7D', '30D', '90D', '1Y', 'ALL']
+Layout = Literal['points', 'columns']
 
-class PortfolioSnapshot(BaseModel):
+
+class PortfolioSnapshot(DeferredModel):
     """Snapshot of portfolio at a specific point in time"""
     snapshot_id: str
     user_id: str
-    portfolio_type: str  # 'crypto' or 'stock' or 'combined'
+    portfolio_type: PortfolioType
     snapshot_date: datetime
     total_value: float
     total_invested: float
@@ -16,13 +24,8 @@ class PortfolioSnapshot(BaseModel):
     asset_count: int
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-
 
-class AssetSnapshot(BaseModel):
+class AssetSnapshot(DeferredModel):
     """Snapshot of individual asset at a specific point in time"""
     snapshot_id: str
     user_id: str
@@ -38,14 +41,16 @@ class AssetSnapshot(BaseModel):
     gain_loss_percentage: float
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
+@dataclass(slots=True)
+class HistoricalDataPoint:
+    """
+    Single data point for charts
 
-class HistoricalDataPoint(BaseModel):
-    """Single data point for charts"""
+    A plain slotted dataclass rather than a model: the service builds hundreds
+    per request from its own snapshot rows, and pydantic still serializes it
+    inside PortfolioHistory
+    """
     date: str
     timestamp: datetime
     portfolio_value: float
@@ -59,7 +64,7 @@ class HistoricalDataPoint(BaseModel):
 class PortfolioHistory(BaseModel):
     """Historical portfolio data for a specific period"""
     user_id: str
-    period: str  # '24H', '7D', '30D', '90D', '1Y', 'ALL'
+    period: Period
     start_date: datetime
     end_date: datetime
     data_points: List[HistoricalDataPoint]
@@ -67,14 +72,56 @@ class PortfolioHistory(BaseModel):
     period_change: float
     period_change_percentage: float
 
+    def to_columns(self) -> 'PortfolioHistoryColumns':
+        """
+        Columnar view of this history
+
+        Chart libraries take parallel arrays, and a year of points no longer
+        repeats every key name once per point on the wire
+        """
+        points = self.data_points
+        return PortfolioHistoryColumns.model_construct(
+            user_id=self.user_id,
+            period=self.period,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            dates=[p.date for p in points],
+            timestamps=[int(p.timestamp.timestamp() * 1000) for p in points],
+            portfolio_value=[p.portfolio_value for p in points],
+            invested_value=[p.invested_value for p in points],
+            gain_loss=[p.gain_loss for p in points],
+            gain_loss_percentage=[p.gain_loss_percentage for p in points],
+            current_value=self.current_value,
+            period_change=self.period_change,
+            period_change_percentage=self.period_change_percentage
+        )
+
+
+class PortfolioHistoryColumns(BaseModel):
+    """PortfolioHistory with the data points laid out as parallel arrays"""
+    user_id: str
+    period: Period
+    start_date: datetime
+    end_date: datetime
+    dates: List[str]
+    timestamps: List[int]  # epoch milliseconds
+    portfolio_value: List[float]
+    invested_value: List[Optional[float]]
+    gain_loss: List[Optional[float]]
+    gain_loss_percentage: List[Optional[float]]
+    current_value: float
+    period_change: float
+    period_change_percentage: float
+
 
 class SnapshotRequest(BaseModel):
     """Request to create a snapshot"""
-    portfolio_type: str = 'combined'  # 'crypto', 'stock', or 'combined'
+    portfolio_type: PortfolioType = 'combined'
 
 
 class HistoryRequest(BaseModel):
     """Request for historical data"""
-    period: str = '30D'  # '24H', '7D', '30D', '90D', '1Y', 'ALL'
-    portfolio_type: str = 'combined'  # 'crypto', 'stock', or 'combined'
+    period: Period = '30D'
+    portfolio_type: PortfolioType = 'combined'
     include_benchmarks: bool = False  # Include BTC and S&P 500 comparison
+    layout: Layout = 'points'  # 'points' (list of objects) or 'columns' (parallel arrays)
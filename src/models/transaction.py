@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import Optional, Literal
+from typing import Any, Dict, Optional, Literal
 from pydantic import BaseModel, Field
+from .base import DeferredModel
 from enum import Enum
 
 
@@ -19,7 +20,7 @@ class CostBasisMethod(str, Enum):
     AVERAGE = 'average'  # Average Cost
 
 
-class Transaction(BaseModel):
+class Transaction(DeferredModel):
     """Transaction model representing a buy/sell/transfer"""
     transaction_id: str
     user_id: str
@@ -39,6 +40,23 @@ class Transaction(BaseModel):
     class Config:
         use_enum_values = True
 
+    @classmethod
+    def from_db(cls, item: Dict[str, Any]) -> 'Transaction':
+        """
+        Build a Transaction from a DynamoDB item without re-validating it
+
+        Items are only ever written from validated Transactions, so a full
+        validation pass on every read is pure overhead. Only the ISO datetime
+        strings need converting back; key attributes (PK, SK, ...) are dropped
+        """
+        fields = cls.model_fields
+        values = {k: v for k, v in item.items() if k in fields}
+        for name in ('transaction_date', 'created_at', 'updated_at'):
+            value = values.get(name)
+            if isinstance(value, str):
+                values[name] = datetime.fromisoformat(value)
+        return cls.model_construct(**values)
+
 
 class TransactionCreate(BaseModel):
     """Request model for creating a transaction"""
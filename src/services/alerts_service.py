@@ -3,9 +3,11 @@ Alerts Service
 Handles alert creation, evaluation, and triggering
 """
 import logging
+import threading
 import uuid
+from concurrent.futures import Future
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from decimal import Decimal
 
 from models.alert import (
@@ -19,6 +21,9 @@ from services.price_service import price_service
 
 logger = logging.getLogger(__name__)
 
+# Guards the read cache shared by the alert checker's worker threads
+_cache_lock = threading.Lock()
+
 
 class AlertsService:
     """Service for managing portfolio alerts"""
@@ -57,18 +62,32 @@ class AlertsService:
         )
 
         # Store in DynamoDB
-        self.db_service.put_item({
-            'PK': user_id,
-            'SK': f'ALERT#{alert_id}',
-            'entity_type': 'alert',
-            'GSI1PK': f'USER#{user_id}',
-            'GSI1SK': f'ALERT#{alert.status.value}#{now.isoformat()}',
-            **alert.dict()
-        })
+        self.db_service.put_item(self._alert_item(alert, now))
 
         logger.info(f"Created alert {alert_id} for user {user_id}")
         return alert
 
+    def _alert_item(self, alert: Alert, timestamp: datetime) -> Dict[str, Any]:
+        """
+        Build the DynamoDB item for an alert
+
+        Active alerts also carry the sparse GSI2 keys so the alert checker can
+        query AlertStatusIndex instead of scanning the whole table. Any other
+        status omits them, which drops the alert out of the index on save.
+        """
+        item = {
+            'PK': alert.user_id,
+            'SK': f'ALERT#{alert.alert_id}',
+            'entity_type': 'alert',
+            'GSI1PK': f'USER#{alert.user_id}',
+            'GSI1SK': f'ALERT#{alert.status.value}#{timestamp.isoformat()}',
+            **alert.dict()
+        }
+        if alert.status == AlertStatus.ACTIVE:
+            item['GSI2PK'] = 'ALERT#active'
+            item['GSI2SK'] = f'USER#{alert.user_id}'
+        return item
+
     def get_alert(self, user_id: str, alert_id: str) -> Optional[Alert]:
         """Get a specific alert"""
         item = self.db_service.get_item(user_id, f'ALERT#{alert_id}')
@@ -108,6 +127,17 @@ class AlertsService:
             triggered_count=triggered_count
         )
 
+    def list_active_alerts_by_user(self) -> Dict[str, List[Alert]]:
+        """Fetch every active alert from the sparse status index, grouped by user"""
+        alerts_by_user: Dict[str, List[Alert]] = {}
+        items = self.db_service.query_index_partition('AlertStatusIndex', 'GSI2PK', 'ALERT#active')
+
+        for item in items:
+            alert = Alert(**item)
+            alerts_by_user.setdefault(alert.user_id, []).append(alert)
+
+        return alerts_by_user
+
     def update_alert(self, user_id: str, alert_id: str, request: UpdateAlertRequest) -> Optional[Alert]:
         """Update an existing alert"""
         alert = self.get_alert(user_id, alert_id)
@@ -123,14 +153,7 @@ class AlertsService:
         alert.updated_at = datetime.utcnow()
 
         # Save to DynamoDB
-        self.db_service.put_item({
-            'PK': user_id,
-            'SK': f'ALERT#{alert_id}',
-            'entity_type': 'alert',
-            'GSI1PK': f'USER#{user_id}',
-            'GSI1SK': f'ALERT#{alert.status.value}#{alert.updated_at.isoformat()}',
-            **alert.dict()
-        })
+        self.db_service.put_item(self._alert_item(alert, alert.updated_at))
 
         logger.info(f"Updated alert {alert_id} for user {user_id}")
         return alert
@@ -199,12 +222,39 @@ class AlertsService:
             most_triggered_alert=most_triggered
         )
 
-    def evaluate_alert(self, alert: Alert) -> tuple[bool, Dict[str, Any]]:
+    @staticmethod
+    def _cached(cache: Optional[Dict[Any, Any]], key: Any, fetch: Callable[[], Any]) -> Any:
+        """
+        Return cache[key], calling fetch() on a miss (or always, without a cache)
+
+        The cache holds one future per key, so when threads share it only the
+        first caller fetches and the rest wait on its result. A failed fetch
+        is dropped from the cache so a later caller can retry.
+        """
+        if cache is None:
+            return fetch()
+        with _cache_lock:
+            future = cache.get(key)
+            owner = future is None
+            if owner:
+                future = cache[key] = Future()
+        if owner:
+            try:
+                future.set_result(fetch())
+            except Exception as e:
+                with _cache_lock:
+                    cache.pop(key, None)
+                future.set_exception(e)
+        return future.result()
+
+    def evaluate_alert(self, alert: Alert, cache: Optional[Dict[Any, Any]] = None) -> tuple[bool, Dict[str, Any]]:
         """
         Evaluate if an alert condition is met
 
         Args:
             alert: Alert to evaluate
+            cache: Optional dict shared across evaluations to reuse price and
+                portfolio reads; the caller owns its lifetime
 
         Returns:
             Tuple of (condition_met, context_data)
@@ -214,13 +264,13 @@ class AlertsService:
 
         try:
             if condition.type in [AlertType.PRICE_ABOVE, AlertType.PRICE_BELOW]:
-                return self._evaluate_price_alert(alert, context)
+                return self._evaluate_price_alert(alert, context, cache)
 
             elif condition.type in [AlertType.PERCENT_GAIN, AlertType.PERCENT_LOSS]:
-                return self._evaluate_percent_change_alert(alert, context)
+                return self._evaluate_percent_change_alert(alert, context, cache)
 
             elif condition.type in [AlertType.PORTFOLIO_VALUE, AlertType.PORTFOLIO_GAIN, AlertType.PORTFOLIO_LOSS]:
-                return self._evaluate_portfolio_alert(alert, context)
+                return self._evaluate_portfolio_alert(alert, context, cache)
 
             elif condition.type == AlertType.REBALANCE_NEEDED:
                 return self._evaluate_rebalance_alert(alert, context)
@@ -233,7 +283,7 @@ class AlertsService:
             logger.error(f"Error evaluating alert {alert.alert_id}: {str(e)}")
             return False, context
 
-    def _evaluate_price_alert(self, alert: Alert, context: Dict) -> tuple[bool, Dict]:
+    def _evaluate_price_alert(self, alert: Alert, context: Dict, cache: Optional[Dict] = None) -> tuple[bool, Dict]:
         """Evaluate price-based alerts"""
         condition = alert.condition
 
@@ -241,9 +291,10 @@ class AlertsService:
             return False, context
 
         # Get current price
-        current_price = price_service.get_current_price(
-            condition.symbol,
-            condition.asset_type or 'crypto'
+        asset_type = condition.asset_type or 'crypto'
+        current_price = self._cached(
+            cache, ('price', condition.symbol, asset_type),
+            lambda: price_service.get_current_price(condition.symbol, asset_type)
         )
 
         if current_price is None:
@@ -261,7 +312,7 @@ class AlertsService:
 
         return False, context
 
-    def _evaluate_percent_change_alert(self, alert: Alert, context: Dict) -> tuple[bool, Dict]:
+    def _evaluate_percent_change_alert(self, alert: Alert, context: Dict, cache: Optional[Dict] = None) -> tuple[bool, Dict]:
         """Evaluate percentage change alerts"""
         condition = alert.condition
 
@@ -269,9 +320,10 @@ class AlertsService:
             return False, context
 
         # Get asset from portfolio
-        portfolio = portfolio_service.get_portfolio(
-            alert.user_id,
-            condition.asset_type or 'crypto'
+        asset_type = condition.asset_type or 'crypto'
+        portfolio = self._cached(
+            cache, ('portfolio', alert.user_id, asset_type),
+            lambda: portfolio_service.get_portfolio(alert.user_id, asset_type)
         )
 
         asset = next((a for a in portfolio.assets if a.symbol == condition.symbol), None)
@@ -290,12 +342,15 @@ class AlertsService:
 
         return False, context
 
-    def _evaluate_portfolio_alert(self, alert: Alert, context: Dict) -> tuple[bool, Dict]:
+    def _evaluate_portfolio_alert(self, alert: Alert, context: Dict, cache: Optional[Dict] = None) -> tuple[bool, Dict]:
         """Evaluate portfolio-level alerts"""
         condition = alert.condition
 
         # Get portfolio summary
-        summary = portfolio_service.get_portfolio_summary(alert.user_id)
+        summary = self._cached(
+            cache, ('summary', alert.user_id),
+            lambda: portfolio_service.get_portfolio_summary(alert.user_id)
+        )
 
         context['portfolio_value'] = float(summary.total_value)
         context['portfolio_gain_loss_percentage'] = float(summary.total_gain_loss_percentage)
@@ -365,32 +420,33 @@ class AlertsService:
         if alert.trigger_once:
             alert.status = AlertStatus.TRIGGERED
 
-        self.db_service.put_item({
-            'PK': alert.user_id,
-            'SK': f'ALERT#{alert.alert_id}',
-            'entity_type': 'alert',
-            'GSI1PK': f'USER#{alert.user_id}',
-            'GSI1SK': f'ALERT#{alert.status.value}#{now.isoformat()}',
-            **alert.dict()
-        })
+        self.db_service.put_item(self._alert_item(alert, now))
 
         logger.info(f"Triggered alert {alert.alert_id} for user {alert.user_id}")
         return history
 
-    def check_all_alerts_for_user(self, user_id: str) -> List[AlertHistory]:
+    def check_all_alerts_for_user(
+        self,
+        user_id: str,
+        alerts: Optional[List[Alert]] = None,
+        cache: Optional[Dict[Any, Any]] = None
+    ) -> Tuple[List[AlertHistory], int]:
         """
         Check all active alerts for a user
 
         Args:
             user_id: User ID
+            alerts: Already-fetched active alerts; queried when omitted
+            cache: Optional read cache passed through to evaluate_alert
 
         Returns:
-            List of triggered alerts
+            Tuple of (triggered alert histories, number of alerts checked)
         """
         triggered_histories = []
 
         # Get all active alerts
-        alerts = self.list_alerts(user_id, status=AlertStatus.ACTIVE).alerts
+        if alerts is None:
+            alerts = self.list_alerts(user_id, status=AlertStatus.ACTIVE).alerts
         now = datetime.utcnow()
 
         for alert in alerts:
@@ -407,13 +463,13 @@ class AlertsService:
                     continue
 
             # Evaluate alert
-            condition_met, context = self.evaluate_alert(alert)
+            condition_met, context = self.evaluate_alert(alert, cache)
 
             if condition_met:
                 history = self.trigger_alert(alert, context)
                 triggered_histories.append(history)
 
-        return triggered_histories
+        return triggered_histories, len(alerts)
 
 
 # Create singleton instance
@@ -8,13 +8,18 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from decimal import Decimal
 import boto3
+from botocore.config import Config
 from boto3.dynamodb.conditions import Key
 import os
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
+# Keep-alive lets warm Lambda containers reuse the DynamoDB connection
+dynamodb = boto3.resource('dynamodb', config=Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive'}
+))
 table = dynamodb.Table(os.environ.get('DYNAMODB_TABLE', 'portfolio-tracker'))
 
 # Annual risk-free rate (approximate US Treasury rate)
@@ -136,3 +136,7 @@ class AuthService:
             updated_at=datetime.fromisoformat(user_data['updated_at']),
             is_active=user_data['is_active']
         )
+
+
+# Create singleton instance
+auth_service = AuthService()
@@ -1,5 +1,7 @@
 import boto3
 import os
+import threading
+from botocore.config import Config
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from decimal import Decimal
@@ -7,9 +9,38 @@ from decimal import Decimal
 
 class DynamoDBService:
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb')
         self.table_name = os.environ.get('DYNAMODB_TABLE', 'portfolio-tracker')
-        self.table = self.dynamodb.Table(self.table_name)
+        self._local = threading.local()
+
+    @property
+    def table(self):
+        """
+        Return this thread's table resource
+
+        boto3 resources are not thread-safe, so each thread that touches the
+        service (the alert checker fans out across a pool) builds its own from
+        its own session. Keep-alive lets warm Lambda containers reuse them.
+        """
+        table = getattr(self._local, 'table', None)
+        if table is None:
+            dynamodb = boto3.session.Session().resource('dynamodb', config=Config(
+                tcp_keepalive=True,
+                retries={'mode': 'adaptive'}
+            ))
+            table = self._local.table = dynamodb.Table(self.table_name)
+        return table
+
+    def warm(self) -> None:
+        """
+        Open a connection to DynamoDB ahead of the first request
+
+        Best effort: a failure here only means the first query pays the
+        handshake instead
+        """
+        try:
+            self.table.load()
+        except Exception:
+            pass
 
     def _serialize_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """Convert floats to Decimals for DynamoDB"""
@@ -53,44 +84,81 @@ class DynamoDBService:
         item = response.get('Item')
         return self._deserialize_item(item) if item else None
 
+    def _query_all(self, query_params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run a query across every page and deserialize the items in one pass"""
+        items = []
+        while True:
+            response = self.table.query(**query_params)
+            items.extend(self._deserialize_item(item) for item in response.get('Items', []))
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        return items
+
     def query(self, pk: str, sk_prefix: Optional[str] = None) -> List[Dict[str, Any]]:
         """Query items by partition key and optional sort key prefix"""
         if sk_prefix:
-            response = self.table.query(
-                KeyConditionExpression='PK = :pk AND begins_with(SK, :sk)',
-                ExpressionAttributeValues={':pk': pk, ':sk': sk_prefix}
-            )
-        else:
-            response = self.table.query(
-                KeyConditionExpression='PK = :pk',
-                ExpressionAttributeValues={':pk': pk}
-            )
-
-        items = response.get('Items', [])
-        return [self._deserialize_item(item) for item in items]
+            return self._query_all({
+                'KeyConditionExpression': 'PK = :pk AND begins_with(SK, :sk)',
+                'ExpressionAttributeValues': {':pk': pk, ':sk': sk_prefix}
+            })
+        return self._query_all({
+            'KeyConditionExpression': 'PK = :pk',
+            'ExpressionAttributeValues': {':pk': pk}
+        })
 
     def query_gsi(self, gsi_name: str, gsi_pk: str, gsi_sk_prefix: Optional[str] = None) -> List[Dict[str, Any]]:
         """Query GSI by partition key and optional sort key prefix"""
         if gsi_sk_prefix:
-            response = self.table.query(
-                IndexName=gsi_name,
-                KeyConditionExpression='GSI1PK = :pk AND begins_with(GSI1SK, :sk)',
-                ExpressionAttributeValues={':pk': gsi_pk, ':sk': gsi_sk_prefix}
-            )
-        else:
-            response = self.table.query(
-                IndexName=gsi_name,
-                KeyConditionExpression='GSI1PK = :pk',
-                ExpressionAttributeValues={':pk': gsi_pk}
-            )
-
-        items = response.get('Items', [])
-        return [self._deserialize_item(item) for item in items]
+            return self._query_all({
+                'IndexName': gsi_name,
+                'KeyConditionExpression': 'GSI1PK = :pk AND begins_with(GSI1SK, :sk)',
+                'ExpressionAttributeValues': {':pk': gsi_pk, ':sk': gsi_sk_prefix}
+            })
+        return self._query_all({
+            'IndexName': gsi_name,
+            'KeyConditionExpression': 'GSI1PK = :pk',
+            'ExpressionAttributeValues': {':pk': gsi_pk}
+        })
+
+    def query_index_partition(self, index_name: str, pk_attr: str, pk_value: str) -> List[Dict[str, Any]]:
+        """Query every page of a single index partition"""
+        return self._query_all({
+            'IndexName': index_name,
+            'KeyConditionExpression': f'{pk_attr} = :pk',
+            'ExpressionAttributeValues': {':pk': pk_value}
+        })
 
     def delete_item(self, pk: str, sk: str) -> None:
         """Delete an item"""
         self.table.delete_item(Key={'PK': pk, 'SK': sk})
 
+    def increment(self, pk: str, sk: str, attribute: str, expires_at: Optional[int] = None) -> int:
+        """
+        Atomically add 1 to a numeric attribute and return the new value
+
+        The item and attribute are created on first use. expires_at (epoch
+        seconds) is written to the table's `ttl` attribute
+        """
+        update_expression = 'ADD #attr :one'
+        names = {'#attr': attribute}
+        values: Dict[str, Any] = {':one': 1}
+        if expires_at is not None:
+            update_expression += ' SET #ttl = :ttl'
+            names['#ttl'] = 'ttl'
+            values[':ttl'] = expires_at
+
+        response = self.table.update_item(
+            Key={'PK': pk, 'SK': sk},
+            UpdateExpression=update_expression,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+            ReturnValues='UPDATED_NEW'
+        )
+        return int(response['Attributes'][attribute])
+
     def update_item(self, pk: str, sk: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update specific attributes of an item"""
         serialized = self._serialize_item(updates)
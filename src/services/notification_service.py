@@ -1,4 +1,5 @@
 import logging
+import time
 import uuid
 from datetime import datetime, date, timedelta
 from typing import Optional, Dict, Any, List
@@ -16,6 +17,10 @@ from services.dynamodb_service import DynamoDBService
 
 logger = logging.getLogger(__name__)
 
+# Daily counters only matter for their own day; keep them two days, then let
+# DynamoDB's TTL delete them
+EMAIL_COUNT_TTL = 48 * 3600
+
 
 class NotificationService:
     """Service for managing notifications and user preferences"""
@@ -220,33 +225,25 @@ class NotificationService:
 
     def _check_rate_limit(self, preferences: NotificationPreferences) -> bool:
         """Check if user has exceeded daily email limit"""
-        today = date.today().isoformat()
-
-        # Reset counter if it's a new day
-        if preferences.last_email_date != today:
-            preferences.emails_sent_today = 0
-            preferences.last_email_date = today
-
-        return preferences.emails_sent_today < preferences.max_emails_per_day
+        item = self.db_service.get_item(preferences.user_id, self._email_count_key())
+        sent_today = item.get('count', 0) if item else 0
+        return sent_today < preferences.max_emails_per_day
 
     def _increment_email_count(self, user_id: str):
         """Increment the daily email count for a user"""
-        preferences = self.get_user_preferences(user_id)
-        if preferences:
-            today = date.today().isoformat()
-            if preferences.last_email_date != today:
-                preferences.emails_sent_today = 1
-            else:
-                preferences.emails_sent_today += 1
-            preferences.last_email_date = today
-            preferences.updated_at = datetime.utcnow()
+        # One atomic ADD on a per-day counter item instead of rewriting the
+        # whole preferences record; the ttl clears old days automatically
+        self.db_service.increment(
+            user_id,
+            self._email_count_key(),
+            'count',
+            expires_at=int(time.time()) + EMAIL_COUNT_TTL
+        )
 
-            self.db_service.put_item({
-                'PK': user_id,
-                'SK': f"NOTIF_PREFS#{user_id}",
-                'entity_type': 'notification_preferences',
-                **preferences.dict()
-            })
+    @staticmethod
+    def _email_count_key() -> str:
+        """Sort key of today's sent-email counter"""
+        return f"EMAIL_COUNT#{date.today().isoformat()}"
 
     def _update_notification_status(
         self,
@@ -482,3 +479,7 @@ class NotificationService:
             template_name="transaction_confirmation",
             data=data
         )
+
+
+# Create singleton instance
+notification_service = NotificationService()
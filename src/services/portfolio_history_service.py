@@ -23,6 +23,10 @@ class PortfolioHistoryService:
         self.db_service = DynamoDBService()
         self.portfolio_service = PortfolioService()
 
+    def warm(self) -> None:
+        """Pre-open the DynamoDB connection during container init"""
+        self.db_service.warm()
+
     def create_snapshot(self, user_id: str, portfolio_type: str = 'combined') -> Dict[str, Any]:
         """
         Create a snapshot of user's portfolio at current moment
@@ -58,10 +62,10 @@ class PortfolioHistoryService:
                     )
                     snapshots_created.append(crypto_snapshot)
 
-                    # Create asset snapshots
-                    for asset in crypto_portfolio.assets:
+                    # Create asset snapshots, reusing the dumped assets and the one `now`
+                    for asset_data in crypto_dict['assets']:
                         self._create_asset_snapshot(
-                            snapshot_id, user_id, snapshot_date, asset.dict(), now
+                            snapshot_id, user_id, snapshot_date, asset_data, now
                         )
 
             if portfolio_type in ['stock', 'combined']:
@@ -80,10 +84,10 @@ class PortfolioHistoryService:
                     )
                     snapshots_created.append(stock_snapshot)
 
-                    # Create asset snapshots
-                    for asset in stock_portfolio.assets:
+                    # Create asset snapshots, reusing the dumped assets and the one `now`
+                    for asset_data in stock_dict['assets']:
                         self._create_asset_snapshot(
-                            snapshot_id, user_id, snapshot_date, asset.dict(), now
+                            snapshot_id, user_id, snapshot_date, asset_data, now
                         )
 
             # Create combined snapshot if requested
@@ -346,13 +350,14 @@ class PortfolioHistoryService:
             else:
                 date_str = timestamp.strftime('%b %d')
 
+            # Built from our own snapshot rows (numbers already floats)
             data_points.append(HistoricalDataPoint(
                 date=date_str,
                 timestamp=timestamp,
-                portfolio_value=snapshot.get('total_value', 0),
-                invested_value=snapshot.get('total_invested', 0),
-                gain_loss=snapshot.get('total_gain_loss', 0),
-                gain_loss_percentage=snapshot.get('total_gain_loss_percentage', 0)
+                portfolio_value=snapshot.get('total_value', 0.0),
+                invested_value=snapshot.get('total_invested', 0.0),
+                gain_loss=snapshot.get('total_gain_loss', 0.0),
+                gain_loss_percentage=snapshot.get('total_gain_loss_percentage', 0.0)
             ))
 
         return data_points
@@ -395,8 +400,8 @@ class PortfolioHistoryService:
                     timestamp=timestamp,
                     portfolio_value=last_known_value,
                     invested_value=last_known_value,  # Approximation
-                    gain_loss=0,
-                    gain_loss_percentage=0
+                    gain_loss=0.0,
+                    gain_loss_percentage=0.0
                 ))
 
             current_date += timedelta(days=1)
@@ -1,7 +1,7 @@
 import uuid
 import json
-from datetime import datetime, date
-from typing import List, Optional, Union
+from datetime import datetime
+from typing import List, Optional
 from models.portfolio import Asset, AssetCreate, AssetUpdate, Portfolio, PortfolioSummary, AssetType, PurchaseEntry
 from services.dynamodb_service import DynamoDBService
 from services.price_service import PriceService
@@ -12,27 +12,6 @@ class PortfolioService:
         self.db = DynamoDBService()
         self.price_service = PriceService()
 
-    def _normalize_date(self, date_input: Union[date, datetime, str]) -> datetime:
-        """Convert date/datetime/string to datetime object"""
-        if isinstance(date_input, datetime):
-            return date_input
-        elif isinstance(date_input, date):
-            return datetime.combine(date_input, datetime.min.time())
-        elif isinstance(date_input, str):
-            # Try to parse date string
-            try:
-                # Try datetime format first
-                return datetime.fromisoformat(date_input)
-            except:
-                # Try date format (YYYY-MM-DD)
-                try:
-                    parsed_date = datetime.strptime(date_input, '%Y-%m-%d')
-                    return parsed_date
-                except:
-                    # Fallback to current datetime
-                    return datetime.utcnow()
-        return datetime.utcnow()
-
     def _enrich_asset_with_prices(self, asset: Asset) -> Asset:
         """Calculate current value and gain/loss for an asset"""
         try:
@@ -61,7 +40,7 @@ class PortfolioService:
     def add_asset(self, user_id: str, asset_create: AssetCreate) -> Asset:
         """Add a new asset to user's portfolio or average with existing asset"""
         now = datetime.utcnow()
-        purchase_datetime = self._normalize_date(asset_create.purchase_date)
+        purchase_datetime = asset_create.purchase_date
         symbol_upper = asset_create.symbol.upper()
 
         # Check if user already has this asset
@@ -346,8 +325,7 @@ class PortfolioService:
         if asset_update.purchase_price is not None:
             updates['purchase_price'] = asset_update.purchase_price
         if asset_update.purchase_date is not None:
-            purchase_datetime = self._normalize_date(asset_update.purchase_date)
-            updates['purchase_date'] = purchase_datetime.isoformat()
+            updates['purchase_date'] = asset_update.purchase_date.isoformat()
 
         updated_item = self.db.update_item(f'USER#{user_id}', f'ASSET#{asset_id}', updates)
 
@@ -1,4 +1,5 @@
 import requests
+import threading
 from typing import Dict, List
 from datetime import datetime, timedelta
 import os
@@ -14,6 +15,20 @@ class PriceService:
     def __init__(self):
         self.coingecko_api_key = os.environ.get('COINGECKO_API_KEY', '')
         self.coingecko_base_url = "https://api.coingecko.com/api/v3"
+        self._local = threading.local()
+
+    @property
+    def _session(self) -> requests.Session:
+        """
+        Return this thread's HTTP session
+
+        Keep-alive connections to CoinGecko/Yahoo survive across warm
+        invocations. Sessions are not thread-safe, so each thread gets its own.
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
 
     def _get_cached_price(self, symbol: str, asset_type: str) -> float:
         """Get price from cache if available and not expired"""
@@ -96,7 +111,7 @@ class PriceService:
             if self.coingecko_api_key and len(self.coingecko_api_key.strip()) > 0:
                 params['x_cg_pro_api_key'] = self.coingecko_api_key
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self._session.get(url, params=params, timeout=10)
             response.raise_for_status()
 
             data = response.json()
@@ -152,7 +167,7 @@ class PriceService:
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                 }
 
-                response = requests.get(url, params=params, headers=headers, timeout=10)
+                response = self._session.get(url, params=params, headers=headers, timeout=10)
                 response.raise_for_status()
 
                 data = response.json()
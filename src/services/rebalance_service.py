@@ -3,19 +3,20 @@ Portfolio Rebalancing Service
 Manages target allocations and calculates rebalancing recommendations
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from decimal import Decimal
-import boto3
 from boto3.dynamodb.conditions import Key
-import os
 import uuid
 
+from utils.db import get_table
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ.get('DYNAMODB_TABLE', 'portfolio-tracker'))
+# Runs the holdings and targets queries side by side
+_io_executor = ThreadPoolExecutor(max_workers=2)
 
 
 class RebalanceService:
@@ -28,6 +29,7 @@ class RebalanceService:
         Get user's target allocation settings
         """
         try:
+            table = get_table()
             response = table.query(
                 KeyConditionExpression=Key('PK').eq(f'USER#{user_id}') &
                                       Key('SK').begins_with('TARGET_ALLOCATION#')
@@ -87,6 +89,7 @@ class RebalanceService:
                 item['category'] = category
 
             # Check if exists to set created_at
+            table = get_table()
             existing = table.get_item(
                 Key={'PK': f'USER#{user_id}', 'SK': f'TARGET_ALLOCATION#{allocation_id}'}
             ).get('Item')
@@ -114,6 +117,7 @@ class RebalanceService:
         Delete a target allocation
         """
         try:
+            table = get_table()
             table.delete_item(
                 Key={
                     'PK': f'USER#{user_id}',
@@ -133,11 +137,14 @@ class RebalanceService:
         """
         Calculate rebalancing recommendations based on target allocations
         """
+        # Target allocations and current holdings are independent queries
+        targets_future = _io_executor.submit(self.get_target_allocations, user_id)
+
         # Get current holdings
         holdings = self._get_current_holdings(user_id)
 
         # Get target allocations
-        targets = self.get_target_allocations(user_id)
+        targets = targets_future.result()
 
         if not holdings:
             return {
@@ -296,6 +303,7 @@ class RebalanceService:
     def _get_current_holdings(self, user_id: str) -> List[Dict]:
         """Get current portfolio holdings"""
         try:
+            table = get_table()
             response = table.query(
                 KeyConditionExpression=Key('PK').eq(f'USER#{user_id}') &
                                       Key('SK').begins_with('ASSET#')
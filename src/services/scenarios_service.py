@@ -3,18 +3,26 @@ Portfolio Scenarios & Projections Service
 Provides future value calculations, goal tracking, and Monte Carlo simulations
 """
 import math
-import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Any, Optional
 import logging
+import uuid
+
+import numpy as np
+from boto3.dynamodb.conditions import Key
 
 from services.portfolio_service import portfolio_service
 from services.portfolio_history_service import portfolio_history_service
 from models.portfolio_history import HistoryRequest
+from utils.db import get_table
 
 logger = logging.getLogger()
 
+# Overlaps the portfolio summary with the (independent) history fetch
+_io_executor = ThreadPoolExecutor(max_workers=4)
+
 
 class ScenariosService:
     """Service for portfolio projections and scenario analysis"""
@@ -40,6 +48,10 @@ class ScenariosService:
             expected_return: Expected annual return (if None, use historical)
             inflation_rate: Annual inflation rate for real value calculation
         """
+        history_future = None
+        if expected_return is None:
+            history_future = _io_executor.submit(self._history_points, user_id)
+
         # Get current portfolio value
         summary = portfolio_service.get_portfolio_summary(user_id)
         current_value = float(summary.total_value)
@@ -51,8 +63,8 @@ class ScenariosService:
             }
 
         # Calculate expected return from historical data if not provided
-        if expected_return is None:
-            expected_return = self._calculate_historical_return(user_id)
+        if history_future is not None:
+            expected_return = self._calculate_historical_return(user_id, history_future.result())
 
         # Monthly rate
         monthly_rate = expected_return / 12
@@ -121,6 +133,8 @@ class ScenariosService:
             simulations: Number of simulation runs
             monthly_contribution: Monthly contribution amount
         """
+        history_future = _io_executor.submit(self._history_points, user_id)
+
         # Get current portfolio value
         summary = portfolio_service.get_portfolio_summary(user_id)
         current_value = float(summary.total_value)
@@ -131,30 +145,29 @@ class ScenariosService:
                 'message': 'No portfolio value or contributions to simulate'
             }
 
-        # Get historical volatility and return
-        historical_return = self._calculate_historical_return(user_id)
-        historical_volatility = self._calculate_historical_volatility(user_id)
+        # Get historical volatility and return from one history load
+        data_points = history_future.result()
+        historical_return = self._calculate_historical_return(user_id, data_points)
+        historical_volatility = self._calculate_historical_volatility(user_id, data_points)
 
         # Default values if no history
         if historical_return == 0.08:  # Default was used
             historical_volatility = 0.15  # 15% default volatility
 
-        # Run simulations
-        results = []
+        # Run simulations; every path advances one month per step, so the
+        # per-month work is a handful of vector ops over all simulations
         monthly_return = historical_return / 12
         monthly_volatility = historical_volatility / math.sqrt(12)
+        rng = np.random.default_rng()
 
-        for _ in range(simulations):
-            value = current_value
-            for month in range(years * 12):
-                # Add contribution
-                value += monthly_contribution
-                # Random return based on normal distribution
-                random_return = random.gauss(monthly_return, monthly_volatility)
-                value *= (1 + random_return)
-                # Prevent negative values
-                value = max(0, value)
-            results.append(value)
+        results = np.full(simulations, current_value)
+        for _ in range(years * 12):
+            # Add contribution
+            results += monthly_contribution
+            # Random return based on normal distribution
+            results *= 1 + rng.normal(monthly_return, monthly_volatility, simulations)
+            # Prevent negative values
+            np.maximum(results, 0, out=results)
 
         # Sort results for percentile calculation
         results.sort()
@@ -162,7 +175,7 @@ class ScenariosService:
         # Calculate percentiles
         def percentile(data, p):
             index = int(len(data) * p / 100)
-            return data[min(index, len(data) - 1)]
+            return float(data[min(index, len(data) - 1)])
 
         p5 = percentile(results, 5)
         p25 = percentile(results, 25)
@@ -170,22 +183,22 @@ class ScenariosService:
         p75 = percentile(results, 75)
         p95 = percentile(results, 95)
 
-        avg = sum(results) / len(results)
+        avg = float(results.mean())
 
         # Calculate probability of different outcomes
-        prob_double = sum(1 for r in results if r >= current_value * 2) / simulations * 100
-        prob_loss = sum(1 for r in results if r < current_value) / simulations * 100
+        prob_double = float(np.count_nonzero(results >= current_value * 2)) / simulations * 100
+        prob_loss = float(np.count_nonzero(results < current_value)) / simulations * 100
 
         # Create distribution buckets
-        min_val = min(results)
-        max_val = max(results)
+        min_val = float(results[0])
+        max_val = float(results[-1])
         bucket_size = (max_val - min_val) / 20
         distribution = []
 
         for i in range(20):
             bucket_min = min_val + i * bucket_size
             bucket_max = bucket_min + bucket_size
-            count = sum(1 for r in results if bucket_min <= r < bucket_max)
+            count = int(np.count_nonzero((results >= bucket_min) & (results < bucket_max)))
             distribution.append({
                 'range_min': round(bucket_min, 2),
                 'range_max': round(bucket_max, 2),
@@ -226,9 +239,6 @@ class ScenariosService:
         notes: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a financial goal"""
-        from utils.db import get_table
-        import uuid
-
         table = get_table()
         goal_id = str(uuid.uuid4())
 
@@ -284,9 +294,6 @@ class ScenariosService:
 
     def get_goals(self, user_id: str) -> Dict[str, Any]:
         """Get all goals for a user"""
-        from utils.db import get_table
-        from boto3.dynamodb.conditions import Key
-
         table = get_table()
 
         response = table.query(
@@ -347,8 +354,6 @@ class ScenariosService:
 
     def delete_goal(self, user_id: str, goal_id: str) -> Dict[str, Any]:
         """Delete a goal"""
-        from utils.db import get_table
-
         table = get_table()
 
         table.delete_item(
@@ -380,10 +385,6 @@ class ScenariosService:
             monthly_expense_retirement: Monthly expenses in retirement
             social_security: Expected monthly social security
         """
-        # Get current portfolio
-        summary = portfolio_service.get_portfolio_summary(user_id)
-        current_value = float(summary.total_value)
-
         years_to_retirement = retirement_age - current_age
         if years_to_retirement <= 0:
             return {
@@ -391,8 +392,14 @@ class ScenariosService:
                 'message': 'Retirement age must be greater than current age'
             }
 
+        history_future = _io_executor.submit(self._history_points, user_id)
+
+        # Get current portfolio
+        summary = portfolio_service.get_portfolio_summary(user_id)
+        current_value = float(summary.total_value)
+
         # Accumulation phase
-        expected_return = self._calculate_historical_return(user_id)
+        expected_return = self._calculate_historical_return(user_id, history_future.result())
         monthly_rate = expected_return / 12
 
         # Calculate value at retirement
@@ -459,12 +466,20 @@ class ScenariosService:
             'distribution_projections': distribution_projections
         }
 
-    def _calculate_historical_return(self, user_id: str) -> float:
-        """Calculate historical annualized return from portfolio history"""
+    def _history_points(self, user_id: str) -> List[Any]:
+        """Load the 1Y combined history behind the return/volatility estimates"""
         try:
             request = HistoryRequest(period='1Y', portfolio_type='combined')
-            history = portfolio_history_service.get_portfolio_history(user_id, request)
-            data_points = history.data_points
+            return portfolio_history_service.get_portfolio_history(user_id, request).data_points
+        except Exception as e:
+            logger.error(f"Error loading portfolio history: {e}")
+            return []
+
+    def _calculate_historical_return(self, user_id: str, data_points: Optional[List[Any]] = None) -> float:
+        """Calculate historical annualized return from portfolio history"""
+        try:
+            if data_points is None:
+                data_points = self._history_points(user_id)
 
             if len(data_points) < 2:
                 return 0.08  # Default 8% if not enough data
@@ -492,12 +507,11 @@ class ScenariosService:
             logger.error(f"Error calculating historical return: {e}")
             return 0.08
 
-    def _calculate_historical_volatility(self, user_id: str) -> float:
+    def _calculate_historical_volatility(self, user_id: str, data_points: Optional[List[Any]] = None) -> float:
         """Calculate historical volatility from portfolio history"""
         try:
-            request = HistoryRequest(period='1Y', portfolio_type='combined')
-            history = portfolio_history_service.get_portfolio_history(user_id, request)
-            data_points = history.data_points
+            if data_points is None:
+                data_points = self._history_points(user_id)
 
             if len(data_points) < 30:
                 return 0.15  # Default 15% if not enough data
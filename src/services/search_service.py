@@ -9,7 +9,7 @@ from typing import Dict, List, Any, Optional
 import uuid
 
 from boto3.dynamodb.conditions import Key, Attr
-from utils.db import get_table
+from utils.db import get_table, warm as warm_table
 
 logger = logging.getLogger()
 
@@ -17,6 +17,10 @@ logger = logging.getLogger()
 class SearchService:
     """Service for global search and filtering"""
 
+    def warm(self) -> None:
+        """Open the DynamoDB connection during container init"""
+        warm_table()
+
     def global_search(
         self,
         user_id: str,
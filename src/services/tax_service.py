@@ -4,16 +4,21 @@ Calculates capital gains/losses, generates tax reports, and detects wash sales
 """
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from decimal import Decimal
 import boto3
+from botocore.config import Config
 from boto3.dynamodb.conditions import Key
 import os
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
+# Keep-alive lets warm Lambda containers reuse the DynamoDB connection
+dynamodb = boto3.resource('dynamodb', config=Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive'}
+))
 table = dynamodb.Table(os.environ.get('DYNAMODB_TABLE', 'portfolio-tracker'))
 
 
@@ -23,6 +28,13 @@ class TaxService:
     # IRS wash sale rule: 30 days before and after
     WASH_SALE_WINDOW_DAYS = 30
 
+    def warm(self) -> None:
+        """Open the DynamoDB connection during container init"""
+        try:
+            table.load()
+        except Exception:
+            pass
+
     def get_tax_year_summary(self, user_id: str, tax_year: int) -> Dict[str, Any]:
         """
         Get comprehensive tax summary for a given year
@@ -184,15 +196,22 @@ class TaxService:
             'holdings': unrealized_gains
         }
 
-    def get_tax_loss_harvesting_opportunities(self, user_id: str) -> List[Dict[str, Any]]:
+    def get_tax_loss_harvesting_opportunities(self, user_id: str) -> Tuple[List[Dict[str, Any]], float]:
         """
         Identify assets with unrealized losses that could be sold for tax benefits
+
+        Returns the opportunities (largest loss first) and their total loss,
+        summed during the same scan
         """
         unrealized = self.get_unrealized_gains(user_id)
 
         opportunities = []
+        total_loss = 0.0
         for holding in unrealized['holdings']:
             if holding['unrealized_gain_loss'] < 0:
+                loss = abs(holding['unrealized_gain_loss'])
+                total_loss += loss
+
                 # Check for wash sale risk
                 wash_sale_risk = self._check_wash_sale_risk(
                     user_id,
@@ -203,11 +222,11 @@ class TaxService:
                 opportunities.append({
                     'symbol': holding['symbol'],
                     'asset_type': holding['asset_type'],
-                    'unrealized_loss': abs(holding['unrealized_gain_loss']),
+                    'unrealized_loss': loss,
                     'quantity': holding['quantity'],
                     'current_value': holding['current_value'],
                     'cost_basis': holding['cost_basis'],
-                    'potential_tax_savings_estimate': abs(holding['unrealized_gain_loss']) * 0.25,  # Rough estimate
+                    'potential_tax_savings_estimate': loss * 0.25,  # Rough estimate
                     'wash_sale_risk': wash_sale_risk,
                     'holding_period': holding['holding_period']
                 })
@@ -215,7 +234,7 @@ class TaxService:
         # Sort by largest loss first
         opportunities.sort(key=lambda x: x['unrealized_loss'], reverse=True)
 
-        return opportunities
+        return opportunities, total_loss
 
     def _get_transactions_for_period(self, user_id: str, start_date: datetime, end_date: datetime) -> List[Dict]:
         """Get transactions within a date range"""
@@ -23,6 +23,10 @@ class TransactionService:
     def __init__(self):
         self.db_service = DynamoDBService()
 
+    def warm(self) -> None:
+        """Pre-open the DynamoDB connection during container init"""
+        self.db_service.warm()
+
     def create_transaction(self, user_id: str, transaction_data: TransactionCreate) -> Transaction:
         """
         Create a new transaction
@@ -92,7 +96,7 @@ class TransactionService:
             if not item or item.get('entity_type') != 'transaction':
                 return None
 
-            return Transaction(**item)
+            return Transaction.from_db(item)
 
         except Exception as e:
             logger.error(f"Error getting transaction {transaction_id}: {str(e)}")
@@ -139,7 +143,8 @@ class TransactionService:
                 if asset_type and item.get('asset_type') != asset_type:
                     continue
 
-                if transaction_type and item.get('transaction_type') != transaction_type.value:
+                # Stored as the plain value; a str enum member compares equal to it
+                if transaction_type and item.get('transaction_type') != transaction_type:
                     continue
 
                 transaction_date = datetime.fromisoformat(item['transaction_date'])
@@ -150,7 +155,7 @@ class TransactionService:
                 if end_date and transaction_date > end_date:
                     continue
 
-                transactions.append(Transaction(**item))
+                transactions.append(Transaction.from_db(item))
 
                 if len(transactions) >= limit:
                     break
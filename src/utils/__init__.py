@@ -0,0 +1 @@
+# Shared helpers and maintenance scripts
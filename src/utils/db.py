@@ -0,0 +1,45 @@
+"""
+Shared DynamoDB table handle for services that query the table directly
+"""
+import os
+import threading
+
+import boto3
+from botocore.config import Config
+
+_TABLE_NAME = os.environ.get('DYNAMODB_TABLE', 'portfolio-tracker')
+
+# boto3 resources are not thread-safe, so each thread (request thread or a
+# service's background executor) gets its own, built from its own session
+_local = threading.local()
+
+
+def get_table():
+    """Return this thread's portfolio-tracker table resource"""
+    table = getattr(_local, 'table', None)
+    if table is None:
+        # Keep-alive lets warm invocations reuse the connection
+        dynamodb = boto3.session.Session().resource('dynamodb', config=Config(
+            tcp_keepalive=True,
+            retries={'mode': 'adaptive'}
+        ))
+        table = _local.table = dynamodb.Table(_TABLE_NAME)
+    return table
+
+
+# Built at import so the request thread's resource is created during
+# container init
+get_table()
+
+
+def warm() -> None:
+    """
+    Open a connection to DynamoDB ahead of the first request
+
+    Best effort: a failure here only means the first query pays the
+    handshake instead
+    """
+    try:
+        get_table().load()
+    except Exception:
+        pass
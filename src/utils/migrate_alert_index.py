@@ -0,0 +1,50 @@
+"""
+One-off migration: add active alerts to the sparse AlertStatusIndex
+
+The alert checker reads active alerts only from AlertStatusIndex. Alerts saved
+before the index existed have no GSI2PK/GSI2SK, so this re-puts every active
+alert through AlertsService._alert_item to give it the index keys. Safe to
+re-run; alerts already in the index are rewritten unchanged.
+"""
+import sys
+import os
+
+from boto3.dynamodb.conditions import Attr
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.alert import Alert
+from services.alerts_service import alerts_service
+
+
+def migrate_active_alerts(dry_run: bool = False) -> int:
+    """Re-put every active alert so it carries the AlertStatusIndex keys"""
+    db_service = alerts_service.db_service
+    scan_params = {
+        'FilterExpression': Attr('entity_type').eq('alert') & Attr('status').eq('active')
+    }
+
+    migrated = 0
+    while True:
+        response = db_service.table.scan(**scan_params)
+
+        for raw_item in response.get('Items', []):
+            alert = Alert(**db_service._deserialize_item(raw_item))
+            if not dry_run:
+                # Reuse updated_at so GSI1SK keeps its original timestamp
+                db_service.put_item(alerts_service._alert_item(alert, alert.updated_at))
+            migrated += 1
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    return migrated
+
+
+if __name__ == '__main__':
+    dry_run = '--dry-run' in sys.argv[1:]
+    count = migrate_active_alerts(dry_run)
+    action = 'Would migrate' if dry_run else 'Migrated'
+    print(f"{action} {count} active alert(s) into AlertStatusIndex")